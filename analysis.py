@@ -0,0 +1,83 @@
+"""Lazily evaluated, memoized analysis of a single resume."""
+from functools import cached_property
+
+# Results worth persisting between runs, in the order they are usually needed
+CACHED_FIELDS = ('skills', 'contacts', 'word_freq', 'achievements', 'experience_years', 'score')
+
+
+class ResumeAnalysis:
+    """Analysis results for one document, each computed on first access.
+
+    Reading ``analysis.skills`` runs ``extract_skills`` once and memoizes the
+    result on the object, so the Streamlit tabs and the batch paths only pay
+    for the results they actually read. ``precomputed`` seeds results that are
+    already known, e.g. from the AnalysisCache.
+
+    Scoring, job matching, cover letters and suggestions all read from the same
+    object, so no extractor runs twice for one document.
+    """
+
+    def __init__(self, analyzer, text, precomputed=None, key=None):
+        self.analyzer = analyzer
+        self.text = text
+        self.key = key
+        self.saved_fields = set()  # results already persisted by an AnalysisCache
+        self.truncated = False  # text cut short by the extraction time budget; never cached
+        self.job_matches = {}  # job role -> (match percentage, missing skills, matched skills)
+        self.cover_letter_writers = {}  # candidate name -> CoverLetterWriter
+        self.__dict__.update(precomputed or {})
+
+    @cached_property
+    def skills(self):
+        return self.analyzer.extract_skills(self.text)
+
+    @cached_property
+    def scan(self):
+        # One regex pass feeds contacts, achievements and experience years
+        return self.analyzer.scan(self.text)
+
+    @cached_property
+    def contacts(self):
+        return self.analyzer.extract_contact_info(self.text, self.scan)
+
+    @cached_property
+    def word_freq(self):
+        return self.analyzer.get_word_frequency(self.text)
+
+    @cached_property
+    def achievements(self):
+        return self.analyzer.extract_quantifiable_achievements(self.text, self.scan)
+
+    @cached_property
+    def experience_years(self):
+        return self.analyzer.extract_years_of_experience(self.text, self.scan)
+
+    @cached_property
+    def score(self):
+        return self.analyzer.calculate_resume_score(self.text, self.skills, contacts=self.contacts)
+
+    @cached_property
+    def word_count(self):
+        return len(self.text.split())
+
+    @cached_property
+    def name(self):
+        return self.analyzer.extract_name_from_resume(self.text)
+
+    def job_match(self, job_role):
+        """calculate_job_match for this resume, memoized per role"""
+        if job_role not in self.job_matches:
+            self.job_matches[job_role] = self.analyzer.calculate_job_match(self.skills, job_role)
+        return self.job_matches[job_role]
+
+    def cover_letters(self, name):
+        """CoverLetterWriter for this resume and candidate name, memoized per name"""
+        writer = self.cover_letter_writers.get(name)
+        if writer is None:
+            from cover_letters import CoverLetterWriter
+            writer = self.cover_letter_writers[name] = CoverLetterWriter(self, name)
+        return writer
+
+    def computed_fields(self):
+        """Cacheable results that have been computed (or seeded) so far"""
+        return {name: self.__dict__[name] for name in CACHED_FIELDS if name in self.__dict__}
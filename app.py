@@ -1,406 +1,201 @@
-import streamlit as st
-import pandas as pd
-import re
 from collections import Counter
-import PyPDF2
-import docx
 from io import BytesIO
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-import random
+import os
+import hashlib
+import json
+from functools import cached_property, lru_cache
+from cache import AnalysisCache, file_key
+from cover_letters import DEFAULT_TEMPLATE, DEFAULT_TONE, load_letter_templates
+from analysis import ResumeAnalysis
+from taxonomy import load_taxonomy
+from incremental import IncrementalAnalyzer
+from extraction import (
+    DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, DEFAULT_MAX_SECONDS, DEFAULT_PARALLEL_PAGE_THRESHOLD,
+    extract_pdf_pages_parallel, iter_docx_paragraphs, iter_pdf_pages, join_pages
+)
+from nlp import english_stopwords, tokenizer_name, word_tokens
+from scanner import scan_text
+import instrumentation
+from instrumentation import count, instrumented
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Streamlit, pandas, plotly, PyPDF2, NLTK and SciPy are imported on
+# first use, so headless entry points never pay for modules they do not touch.
 
 class ResumeAnalyzer:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        
-        # Common skills and categories
-        self.technical_skills = {
-            'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin'],
-            'web': ['html', 'css', 'react', 'angular', 'vue', 'nodejs', 'express', 'django', 'flask', 'bootstrap'],
-            'database': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'sqlite'],
-            'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform'],
-            'data': ['pandas', 'numpy', 'matplotlib', 'seaborn', 'tensorflow', 'pytorch', 'sklearn', 'tableau', 'powerbi'],
-            'tools': ['git', 'jira', 'confluence', 'jenkins', 'gitlab', 'github']
-        }
+    """Resume analysis over a shared taxonomy.
+    
+    Instances are immutable once built, so one analyzer can safely serve every
+    request in a process; use get_analyzer() to share it.
+    """
+    
+    def __init__(self, taxonomy=None, max_pdf_pages=DEFAULT_MAX_PAGES, max_text_chars=DEFAULT_MAX_CHARS,
+                 max_pdf_seconds=DEFAULT_MAX_SECONDS, pdf_workers=None,
+                 parallel_page_threshold=DEFAULT_PARALLEL_PAGE_THRESHOLD):
+        self.stop_words = english_stopwords()
         
-        # Common soft skills
-        self.soft_skills = [
-            'leadership', 'communication', 'teamwork', 'problem-solving', 'analytical',
-            'creative', 'adaptable', 'organized', 'detail-oriented', 'collaborative'
-        ]
+        # Skills, keywords and job roles come from the (cached) taxonomy index
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.technical_skills = self.taxonomy.technical_skills
+        self.soft_skills = self.taxonomy.soft_skills
+        self.education_keywords = self.taxonomy.education_keywords
+        self.experience_keywords = self.taxonomy.experience_keywords
+        self.job_roles = self.taxonomy.job_roles
         
-        # Education keywords
-        self.education_keywords = [
-            'bachelor', 'master', 'phd', 'degree', 'university', 'college',
-            'education', 'diploma', 'certification', 'course'
-        ]
+        # Extraction budgets for oversized or pathological documents
+        self.max_pdf_pages = max_pdf_pages
+        self.max_text_chars = max_text_chars
+        self.max_pdf_seconds = max_pdf_seconds
         
-        # Experience keywords
-        self.experience_keywords = [
-            'experience', 'work', 'employment', 'job', 'position', 'role',
-            'responsibilities', 'achievements', 'projects'
-        ]
+        # Long PDFs are split across this many processes (None keeps extraction serial)
+        self.pdf_workers = pdf_workers
+        self.parallel_page_threshold = parallel_page_threshold
         
-        # Enhanced job roles with detailed information
-        self.job_roles = {
-            'Software Engineer': {
-                'description': 'Develop and maintain software applications',
-                'key_skills': ['python', 'java', 'javascript', 'sql', 'git', 'problem-solving'],
-                'responsibilities': ['Write clean, maintainable code', 'Debug and troubleshoot issues', 'Collaborate with team members', 'Participate in code reviews'],
-                'industry_keywords': ['software development', 'coding', 'programming', 'algorithms', 'data structures', 'testing', 'debugging'],
-                'value_propositions': [
-                    'deliver high-quality software solutions',
-                    'optimize application performance',
-                    'implement best coding practices',
-                    'contribute to scalable architecture'
-                ],
-                'company_benefits': [
-                    'reduce development time through efficient coding',
-                    'improve code quality and maintainability',
-                    'enhance team productivity through collaboration',
-                    'drive innovation in software solutions'
-                ],
-                'opening_hooks': [
-                    'As a passionate software engineer with expertise in {skills}',
-                    'With a strong foundation in {skills} and proven development experience',
-                    'Having successfully delivered multiple software projects using {skills}'
-                ]
-            },
-            'Data Scientist': {
-                'description': 'Analyze complex data to derive business insights',
-                'key_skills': ['python', 'pandas', 'numpy', 'sklearn', 'matplotlib', 'sql', 'analytical'],
-                'responsibilities': ['Build predictive models', 'Analyze large datasets', 'Create data visualizations', 'Present findings to stakeholders'],
-                'industry_keywords': ['machine learning', 'data analysis', 'statistical modeling', 'data visualization', 'big data', 'analytics'],
-                'value_propositions': [
-                    'transform raw data into actionable insights',
-                    'develop predictive models for business growth',
-                    'optimize decision-making through data-driven solutions',
-                    'identify trends and patterns in complex datasets'
-                ],
-                'company_benefits': [
-                    'increase revenue through data-driven insights',
-                    'improve operational efficiency via predictive analytics',
-                    'reduce risks through statistical modeling',
-                    'enhance customer experience through personalization'
-                ],
-                'opening_hooks': [
-                    'As a data scientist with expertise in {skills} and a passion for uncovering insights',
-                    'With proven experience in {skills} and a track record of delivering data-driven solutions',
-                    'Having successfully built predictive models using {skills}'
-                ]
-            },
-            'Product Manager': {
-                'description': 'Lead product development and strategy',
-                'key_skills': ['leadership', 'analytical', 'communication', 'problem-solving', 'organized'],
-                'responsibilities': ['Define product roadmap', 'Coordinate with development teams', 'Gather user requirements', 'Analyze market trends'],
-                'industry_keywords': ['product strategy', 'roadmap planning', 'stakeholder management', 'user experience', 'market research'],
-                'value_propositions': [
-                    'drive product vision and strategy',
-                    'bridge technical and business requirements',
-                    'optimize user experience and satisfaction',
-                    'lead cross-functional teams to success'
-                ],
-                'company_benefits': [
-                    'accelerate product development cycles',
-                    'increase user engagement and retention',
-                    'maximize product-market fit',
-                    'drive revenue growth through strategic planning'
-                ],
-                'opening_hooks': [
-                    'As a strategic product manager with strong {skills} capabilities',
-                    'With proven experience in {skills} and successful product launches',
-                    'Having led cross-functional teams with expertise in {skills}'
-                ]
-            },
-            'Frontend Developer': {
-                'description': 'Create user interfaces and web experiences',
-                'key_skills': ['html', 'css', 'javascript', 'react', 'angular', 'vue', 'creative'],
-                'responsibilities': ['Develop responsive web interfaces', 'Optimize user experience', 'Collaborate with designers', 'Ensure cross-browser compatibility'],
-                'industry_keywords': ['user interface', 'responsive design', 'web development', 'user experience', 'frontend frameworks'],
-                'value_propositions': [
-                    'create engaging and intuitive user interfaces',
-                    'optimize web performance and accessibility',
-                    'implement responsive designs across devices',
-                    'bridge design and development seamlessly'
-                ],
-                'company_benefits': [
-                    'improve user engagement through intuitive interfaces',
-                    'reduce bounce rates with optimized UX',
-                    'increase conversion rates through better design',
-                    'enhance brand perception through modern web presence'
-                ],
-                'opening_hooks': [
-                    'As a frontend developer with expertise in {skills} and an eye for design',
-                    'With strong proficiency in {skills} and passion for creating user-centric experiences',
-                    'Having built responsive web applications using {skills}'
-                ]
-            },
-            'Backend Developer': {
-                'description': 'Build server-side applications and APIs',
-                'key_skills': ['python', 'java', 'nodejs', 'sql', 'mongodb', 'docker', 'problem-solving'],
-                'responsibilities': ['Design and implement APIs', 'Optimize database performance', 'Ensure system scalability', 'Implement security measures'],
-                'industry_keywords': ['server-side development', 'API design', 'database optimization', 'system architecture', 'scalability'],
-                'value_propositions': [
-                    'architect scalable backend systems',
-                    'optimize database performance and queries',
-                    'ensure robust API design and security',
-                    'implement efficient data processing solutions'
-                ],
-                'company_benefits': [
-                    'improve system performance and reliability',
-                    'reduce server costs through optimization',
-                    'enhance data security and compliance',
-                    'enable seamless integration with external systems'
-                ],
-                'opening_hooks': [
-                    'As a backend developer with deep expertise in {skills}',
-                    'With proven experience in {skills} and scalable system design',
-                    'Having architected robust backend solutions using {skills}'
-                ]
-            },
-            'DevOps Engineer': {
-                'description': 'Manage infrastructure and deployment pipelines',
-                'key_skills': ['aws', 'azure', 'docker', 'kubernetes', 'terraform', 'jenkins', 'analytical'],
-                'responsibilities': ['Automate deployment processes', 'Monitor system performance', 'Manage cloud infrastructure', 'Implement CI/CD pipelines'],
-                'industry_keywords': ['cloud infrastructure', 'automation', 'continuous integration', 'containerization', 'monitoring'],
-                'value_propositions': [
-                    'streamline deployment and release processes',
-                    'optimize cloud infrastructure costs',
-                    'implement robust monitoring and alerting',
-                    'ensure high availability and disaster recovery'
-                ],
-                'company_benefits': [
-                    'reduce deployment time and errors',
-                    'lower infrastructure costs through optimization',
-                    'improve system reliability and uptime',
-                    'accelerate development velocity'
-                ],
-                'opening_hooks': [
-                    'As a DevOps engineer with expertise in {skills} and cloud technologies',
-                    'With proven experience in {skills} and infrastructure automation',
-                    'Having successfully managed cloud environments using {skills}'
-                ]
-            },
-            'UX/UI Designer': {
-                'description': 'Design user experiences and interfaces',
-                'key_skills': ['creative', 'analytical', 'communication', 'detail-oriented', 'collaborative'],
-                'responsibilities': ['Create user-centered designs', 'Conduct user research', 'Develop prototypes', 'Collaborate with developers'],
-                'industry_keywords': ['user experience', 'user interface', 'design thinking', 'prototyping', 'user research'],
-                'value_propositions': [
-                    'create intuitive and engaging user experiences',
-                    'conduct comprehensive user research and testing',
-                    'design accessible and inclusive interfaces',
-                    'collaborate effectively with development teams'
-                ],
-                'company_benefits': [
-                    'increase user satisfaction and engagement',
-                    'improve product usability and accessibility',
-                    'reduce development costs through clear design specifications',
-                    'enhance brand perception through thoughtful design'
-                ],
-                'opening_hooks': [
-                    'As a UX/UI designer with strong {skills} and user-centered approach',
-                    'With proven experience in {skills} and successful product launches',
-                    'Having created engaging user experiences with focus on {skills}'
-                ]
-            },
-            'Business Analyst': {
-                'description': 'Analyze business processes and requirements',
-                'key_skills': ['analytical', 'communication', 'problem-solving', 'detail-oriented', 'organized'],
-                'responsibilities': ['Gather business requirements', 'Analyze current processes', 'Recommend improvements', 'Create documentation'],
-                'industry_keywords': ['business analysis', 'process improvement', 'requirements gathering', 'stakeholder management'],
-                'value_propositions': [
-                    'optimize business processes for efficiency',
-                    'bridge communication between technical and business teams',
-                    'identify cost-saving opportunities',
-                    'facilitate digital transformation initiatives'
-                ],
-                'company_benefits': [
-                    'improve operational efficiency and reduce costs',
-                    'streamline business processes and workflows',
-                    'enhance decision-making through data analysis',
-                    'accelerate project delivery through clear requirements'
-                ],
-                'opening_hooks': [
-                    'As a business analyst with strong {skills} and process optimization experience',
-                    'With proven expertise in {skills} and successful business transformations',
-                    'Having improved business processes through {skills} and analytical thinking'
-                ]
-            },
-            'Marketing Manager': {
-                'description': 'Develop and execute marketing strategies',
-                'key_skills': ['communication', 'creative', 'analytical', 'leadership', 'organized'],
-                'responsibilities': ['Develop marketing campaigns', 'Analyze market trends', 'Manage marketing budget', 'Coordinate with sales teams'],
-                'industry_keywords': ['marketing strategy', 'campaign management', 'brand development', 'digital marketing', 'market research'],
-                'value_propositions': [
-                    'develop comprehensive marketing strategies',
-                    'optimize campaign performance and ROI',
-                    'build strong brand presence and awareness',
-                    'drive customer acquisition and retention'
-                ],
-                'company_benefits': [
-                    'increase brand visibility and market share',
-                    'generate qualified leads and drive revenue',
-                    'improve customer engagement and loyalty',
-                    'optimize marketing spend and ROI'
-                ],
-                'opening_hooks': [
-                    'As a marketing manager with expertise in {skills} and proven campaign success',
-                    'With strong background in {skills} and data-driven marketing approach',
-                    'Having led successful marketing initiatives using {skills}'
-                ]
-            },
-            'Cybersecurity Analyst': {
-                'description': 'Protect organizations from security threats',
-                'key_skills': ['analytical', 'detail-oriented', 'problem-solving', 'communication', 'adaptable'],
-                'responsibilities': ['Monitor security systems', 'Investigate security incidents', 'Implement security measures', 'Conduct risk assessments'],
-                'industry_keywords': ['cybersecurity', 'threat detection', 'risk assessment', 'security monitoring', 'incident response'],
-                'value_propositions': [
-                    'protect critical business assets and data',
-                    'implement comprehensive security frameworks',
-                    'respond quickly to security incidents',
-                    'ensure regulatory compliance and best practices'
-                ],
-                'company_benefits': [
-                    'reduce security risks and potential breaches',
-                    'maintain customer trust and reputation',
-                    'ensure compliance with industry regulations',
-                    'minimize downtime from security incidents'
-                ],
-                'opening_hooks': [
-                    'As a cybersecurity analyst with strong {skills} and threat detection expertise',
-                    'With proven experience in {skills} and security incident response',
-                    'Having protected organizations through {skills} and proactive security measures'
-                ]
-            }
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"ResumeAnalyzer is immutable; cannot set '{name}'")
+        super().__setattr__(name, value)
+
+    @cached_property
+    def vocabulary_version(self):
+        """Fingerprint of the vocabularies that analysis results depend on"""
+        vocabularies = {
+            'taxonomy': self.taxonomy.version,
+            'stop_words': sorted(self.stop_words),
+            'tokenizer': tokenizer_name(),
+            'extraction_budget': [self.max_pdf_pages, self.max_text_chars]
         }
+        encoded = json.dumps(vocabularies, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    def iter_pdf_pages(self, pdf_file):
+        """Yield PDF page texts incrementally, within the analyzer's extraction budgets"""
+        return iter_pdf_pages(pdf_file, self.max_pdf_pages, self.max_text_chars, self.max_pdf_seconds)
+
+    @instrumented
+    def read_pdf_text(self, pdf_file):
+        """Read text from PDF file, raising on malformed input"""
+        if self.pdf_workers and self.pdf_workers > 1:
+            import PyPDF2
+            data = pdf_file.read()
+            page_count = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+            if page_count >= self.parallel_page_threshold:
+                pages = extract_pdf_pages_parallel(
+                    data, self.pdf_workers, self.max_pdf_pages, self.max_text_chars, self.max_pdf_seconds,
+                    page_count=page_count
+                )
+                count(pages=len(pages))
+                return join_pages(pages)
+            pdf_file = BytesIO(data)
+        pages = list(self.iter_pdf_pages(pdf_file))
+        count(pages=len(pages))
+        return join_pages(pages)
+
+    @instrumented
+    def read_docx_text(self, docx_file):
+        """Read text from DOCX file, raising on malformed input"""
+        paragraphs = list(iter_docx_paragraphs(docx_file, self.max_text_chars))
+        count(paragraphs=len(paragraphs))
+        return "".join(paragraph + "\n" for paragraph in paragraphs)
 
     def extract_text_from_pdf(self, pdf_file):
         """Extract text from PDF file"""
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+            return self.read_pdf_text(pdf_file)
         except Exception as e:
+            import streamlit as st
             st.error(f"Error reading PDF: {str(e)}")
             return ""
 
     def extract_text_from_docx(self, docx_file):
         """Extract text from DOCX file"""
         try:
-            doc = docx.Document(docx_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return self.read_docx_text(docx_file)
         except Exception as e:
+            import streamlit as st
             st.error(f"Error reading DOCX: {str(e)}")
             return ""
 
-    def extract_contact_info(self, text):
+    @instrumented
+    def extract_text_from_bytes(self, data, extension):
+        """Extract text from PDF, DOCX or TXT file contents, raising on failure"""
+        extension = extension.lower()
+        if extension == '.pdf':
+            return self.read_pdf_text(BytesIO(data))
+        if extension == '.docx':
+            return self.read_docx_text(BytesIO(data))
+        if extension == '.txt':
+            return str(data, "utf-8")
+        raise ValueError(f"Unsupported file type: {extension}")
+
+    def extract_text_from_path(self, path):
+        """Extract text from a PDF, DOCX or TXT file on disk, raising on failure"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        return self.extract_text_from_bytes(data, os.path.splitext(path)[1])
+
+    @instrumented
+    def scan(self, text):
+        """Scan text once for contacts, experience years and achievements"""
+        scan = scan_text(text)
+        count(sentences=scan['sentences'])
+        return scan
+
+    @instrumented
+    def extract_contact_info(self, text, scan=None):
         """Extract contact information from text"""
-        contact_info = {}
-        
-        # Email regex
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        contact_info['emails'] = emails
-        
-        # Phone regex
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        contact_info['phones'] = phones
-        
-        # LinkedIn regex
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        linkedin = re.findall(linkedin_pattern, text.lower())
-        contact_info['linkedin'] = linkedin
-        
-        return contact_info
+        scan = scan or self.scan(text)
+        return {
+            'emails': scan['emails'],
+            'phones': scan['phones'],
+            'linkedin': scan['linkedin'],
+        }
 
+    @instrumented
     def extract_skills(self, text):
         """Extract technical and soft skills from text"""
-        text_lower = text.lower()
-        found_skills = {'technical': {}, 'soft': []}
-        
-        # Technical skills
-        for category, skills in self.technical_skills.items():
-            found_skills['technical'][category] = []
-            for skill in skills:
-                if skill in text_lower:
-                    found_skills['technical'][category].append(skill)
-        
-        # Soft skills
-        for skill in self.soft_skills:
-            if skill in text_lower or skill.replace('-', ' ') in text_lower:
+        # One pass over the text finds every skill (or alias) as a whole token
+        return self.group_skills(self.taxonomy.find_skill_ids(text))
+
+    @instrumented(sized=False)
+    def extract_skills_from_stream(self, chunks):
+        """Extract skills from text arriving in chunks, e.g. iter_pdf_pages output"""
+        return self.group_skills(self.taxonomy.find_skill_ids_in_stream(chunks))
+
+    def group_skills(self, skill_ids):
+        """Group taxonomy skill ids into technical categories and soft skills"""
+        found_skills = {'technical': {category: [] for category in self.technical_skills}, 'soft': []}
+        for skill_id in skill_ids:
+            skill = self.taxonomy.skills[skill_id]
+            category = self.taxonomy.skill_categories[skill_id]
+            if category is None:
                 found_skills['soft'].append(skill)
+            else:
+                found_skills['technical'][category].append(skill)
         
         return found_skills
 
-    def extract_quantifiable_achievements(self, text):
+    @instrumented
+    def extract_quantifiable_achievements(self, text, scan=None):
         """Extract quantifiable achievements from resume"""
-        achievements = []
-        
-        # Patterns for numbers and percentages
-        number_patterns = [
-            r'\b(\d+(?:\.\d+)?%)\b',  # Percentages
-            r'\b(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:users?|customers?|clients?|projects?|applications?|systems?)\b',  # Numbers with units
-            r'\b(?:increased?|improved?|reduced?|decreased?|saved?|generated?|managed?|led?)\s+.*?(\d+(?:\.\d+)?%)\b',  # Action + percentage
-            r'\b(?:increased?|improved?|reduced?|decreased?|saved?|generated?)\s+.*?(\$\d+(?:,\d{3})*(?:\.\d+)?[kmb]?)\b'  # Money
-        ]
-        
-        sentences = re.split(r'[.!?]+', text)
-        for sentence in sentences:
-            for pattern in number_patterns:
-                matches = re.findall(pattern, sentence.lower())
-                if matches:
-                    clean_sentence = sentence.strip()
-                    if len(clean_sentence) > 20 and len(clean_sentence) < 200:
-                        achievements.append(clean_sentence)
-                        break
-        
-        return list(set(achievements))  # Remove duplicates
+        scan = scan or self.scan(text)
+        return scan['achievements']
 
-    def extract_years_of_experience(self, text):
+    @instrumented
+    def extract_years_of_experience(self, text, scan=None):
         """Extract years of experience from resume"""
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*years?\s*in',
-            r'over\s*(\d+)\s*years?',
-            r'more\s*than\s*(\d+)\s*years?'
-        ]
-        
-        years = []
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(match) for match in matches])
-        
-        return max(years) if years else 0
+        scan = scan or self.scan(text)
+        return max(scan['years']) if scan['years'] else 0
 
-    def calculate_resume_score(self, text, skills):
-        """Calculate a basic resume score"""
+    @instrumented
+    def calculate_resume_score(self, text, skills, contacts=None, keywords=None):
+        """Calculate a basic resume score, reusing already extracted contacts and keywords if given"""
         score = 0
         max_score = 100
         
         # Contact information (20 points)
-        contact_info = self.extract_contact_info(text)
+        contact_info = contacts or self.extract_contact_info(text)
         if contact_info['emails']:
             score += 10
         if contact_info['phones']:
@@ -411,22 +206,33 @@ class ResumeAnalyzer:
         score += min(total_technical_skills * 2, 30)  # Max 30 points for technical skills
         score += min(len(skills['soft']) * 2, 10)  # Max 10 points for soft skills
         
+        keywords_found = keywords if keywords is not None else self.taxonomy.keyword_matcher.find(text)
+        
         # Education keywords (20 points)
-        education_score = sum(1 for keyword in self.education_keywords if keyword in text.lower())
+        education_score = sum(1 for kind, _ in keywords_found if kind == 'education')
         score += min(education_score * 5, 20)
         
         # Experience keywords (20 points)
-        experience_score = sum(1 for keyword in self.experience_keywords if keyword in text.lower())
+        experience_score = sum(1 for kind, _ in keywords_found if kind == 'experience')
         score += min(experience_score * 3, 20)
         
         return min(score, max_score)
 
+    @instrumented
     def get_word_frequency(self, text):
         """Get word frequency analysis"""
-        words = word_tokenize(text.lower())
+        words = word_tokens(text.lower())
+        count(tokens=len(words))
         words = [word for word in words if word.isalpha() and word not in self.stop_words]
         return Counter(words)
     
+    @instrumented(sized=False)
+    def word_count_matrix(self, texts, vocabulary=None):
+        """Document-term count matrix of many texts at once; see vectorize.document_term_matrix"""
+        from vectorize import document_term_matrix
+        return document_term_matrix(texts, vocabulary, self.stop_words)
+    
+    @instrumented(sized=False)
     def calculate_job_match(self, resume_skills, job_role):
         """Calculate how well resume matches a job role"""
         if job_role not in self.job_roles:
@@ -434,23 +240,48 @@ class ResumeAnalyzer:
         
         required_skills = self.job_roles[job_role]['key_skills']
         
-        # Flatten resume skills
+        # Flatten resume skills into a bitset over the taxonomy
         all_resume_skills = []
         for category_skills in resume_skills['technical'].values():
             all_resume_skills.extend(category_skills)
         all_resume_skills.extend(resume_skills['soft'])
+        resume_bits = self.taxonomy.skills_bitset(all_resume_skills)
         
         # Calculate match
-        matched_skills = []
-        for skill in required_skills:
-            if skill in all_resume_skills:
-                matched_skills.append(skill)
+        matched_bits = resume_bits & self.taxonomy.role_bits[job_role]
+        matched_skills = [skill for skill in required_skills if matched_bits >> self.taxonomy.skill_ids[skill] & 1]
         
         match_percentage = (len(matched_skills) / len(required_skills)) * 100
         missing_skills = [skill for skill in required_skills if skill not in matched_skills]
         
         return match_percentage, missing_skills, matched_skills
     
+    @instrumented(sized=False)
+    def rank_job_roles(self, resume_skills, top_k=None):
+        """Rank every job role by how well the resume's skills match it"""
+        all_resume_skills = []
+        for category_skills in resume_skills['technical'].values():
+            all_resume_skills.extend(category_skills)
+        all_resume_skills.extend(resume_skills['soft'])
+        return self.taxonomy.rank_roles(all_resume_skills, top_k=top_k)
+    
+    @instrumented(sized=False)
+    def calculate_description_similarity(self, resume_word_freq, description):
+        """Cosine similarity (0-100) between resume word counts and a job description (see tfidf_similarity)
+        
+        A single pair is too few documents for IDF, so terms are weighted by
+        sublinear frequency alone.
+        """
+        from similarity import tfidf_similarity
+        description_freq = self.get_word_frequency(description)
+        if not resume_word_freq or not description_freq:
+            return 0.0
+        return float(tfidf_similarity([resume_word_freq], [description_freq])[0, 0]) * 100
+    
+    def role_keywords_text(self, job_role):
+        """A job role's industry keywords as a description to score against"""
+        return ', '.join(self.job_roles[job_role]['industry_keywords'])
+    
     def extract_name_from_resume(self, text):
         """Extract name from resume text (simple heuristic)"""
         lines = text.split('\n')
@@ -464,81 +295,63 @@ class ResumeAnalyzer:
                     return ' '.join(words)
         return "Your Name"
     
-    def generate_cover_letter(self, name, job_role, company_name, resume_skills, resume_text):
-        """Generate a sophisticated, personalized cover letter"""
-        if job_role not in self.job_roles:
-            return "Invalid job role selected."
-        
-        job_info = self.job_roles[job_role]
-        match_percentage, missing_skills, matched_skills = self.calculate_job_match(resume_skills, job_role)
-        
-        # Extract quantifiable achievements
-        achievements = self.extract_quantifiable_achievements(resume_text)
-        
-        # Extract years of experience
-        years_experience = self.extract_years_of_experience(resume_text)
-        
-        # Get top matched skills for the opening
-        top_skills = matched_skills[:3] if matched_skills else job_info['key_skills'][:3]
-        skills_text = ', '.join(top_skills)
-        
-        # Select appropriate opening hook
-        opening_hook = random.choice(job_info['opening_hooks']).format(skills=skills_text)
+    @instrumented(sized=False)
+    def generate_cover_letter(self, name, job_role, company_name, analysis, variant=0, tone=DEFAULT_TONE,
+                              focus=None, template=DEFAULT_TEMPLATE):
+        """Generate a sophisticated, personalized cover letter from a ResumeAnalysis.
         
-        # Generate cover letter
-        cover_letter = f"""Dear Hiring Manager,
+        Letters are rendered from tone, focus and layout templates compiled once
+        per resume and role (see cover_letters.py), with phrase choices seeded by
+        the inputs: the same arguments always give the same letter, and repeated
+        ones are served from a cache.
+        """
+        return analysis.cover_letters(name).render(company_name, job_role, variant, tone, focus, template)
 
-{opening_hook}, I am excited to apply for the {job_role} position at {company_name}. """
-        
-        # Add experience context if available
-        if years_experience > 0:
-            cover_letter += f"With {years_experience} years of experience in the field, "
-        
-        cover_letter += f"I am particularly drawn to {company_name} because of your commitment to innovation and excellence in the industry.\n\n"
-        
-        # Technical expertise paragraph
-        if matched_skills:
-            cover_letter += f"My technical expertise perfectly aligns with your requirements, particularly in {', '.join(matched_skills[:4])}. "
-        
-        # Add value proposition
-        value_prop = random.choice(job_info['value_propositions'])
-        cover_letter += f"I excel at helping organizations {value_prop}, which directly supports {company_name}'s mission and goals.\n\n"
-        
-        # Achievements paragraph
-        if achievements:
-            cover_letter += "Key achievements that demonstrate my impact include:\n"
-            for achievement in achievements[:3]:  # Top 3 achievements
-                cover_letter += f"• {achievement.strip()}\n"
-            cover_letter += "\n"
-        else:
-            # Generic achievements based on job role
-            cover_letter += f"In my previous roles, I have consistently delivered results by:\n"
-            for responsibility in job_info['responsibilities'][:3]:
-                cover_letter += f"• {responsibility}\n"
-            cover_letter += "\n"
-        
-        # Company benefits paragraph
-        company_benefit = random.choice(job_info['company_benefits'])
-        cover_letter += f"I am excited about the opportunity to contribute to {company_name}'s success by helping to {company_benefit}. "
-        
-        # Industry knowledge
-        industry_keywords = ', '.join(job_info['industry_keywords'][:3])
-        cover_letter += f"My deep understanding of {industry_keywords} positions me well to make an immediate impact in this role.\n\n"
-        
-        # Future focus and learning
-        if missing_skills:
-            cover_letter += f"I am committed to continuous learning and am particularly interested in expanding my expertise in {', '.join(missing_skills[:2])} to further enhance my contribution to your team.\n\n"
-        
-        # Closing
-        cover_letter += f"I would welcome the opportunity to discuss how my skills and passion for {job_role.lower()} can contribute to {company_name}'s continued success. Thank you for considering my application.\n\n"
-        
-        cover_letter += f"Best regards,\n{name}"
+    @instrumented(sized=False)
+    def generate_cover_letters(self, name, requests, analysis):
+        """Cover letters for many (company, job role[, variant]) requests from one ResumeAnalysis"""
+        return analysis.cover_letters(name).render_many(requests)
+
+    @instrumented(sized=False)
+    def compare_cover_letters(self, name, job_role, company_name, analysis, tones=None, focuses=None, templates=None):
+        """Letters for every (tone, focus, template) combination, sharing one set of phrase choices"""
+        return analysis.cover_letters(name).render_variants(company_name, job_role, tones=tones, focuses=focuses,
+                                                            templates=templates)
+
+    def analyze(self, text):
+        """Lazily evaluated analysis of resume text; results are computed on first access"""
+        return ResumeAnalysis(self, text)
+
+    def analyze_text(self, text, top_words=20, analysis=None, fields=None):
+        """Return plain results for resume text, computing only the requested fields.
         
-        return cover_letter
+        ``analysis`` may be an existing ResumeAnalysis (e.g. seeded from the
+        AnalysisCache) whose memoized results are reused.
+        """
+        analysis = analysis or self.analyze(text)
+        getters = {
+            'word_count': lambda: analysis.word_count,
+            'skills': lambda: analysis.skills,
+            'contact_info': lambda: analysis.contacts,
+            'achievements': lambda: analysis.achievements,
+            'years_of_experience': lambda: analysis.experience_years,
+            'score': lambda: analysis.score,
+            'top_words': lambda: analysis.word_freq.most_common(top_words),
+            'job_matches': lambda: {match['role']: match['match_percentage'] for match in self.rank_job_roles(analysis.skills)}
+        }
+        return {field: getters[field]() for field in (fields or getters)}
+
+    def analyze_many(self, paths, workers=None, cache_path=None, taxonomy_path=None):
+        """Analyze many resume files in parallel; see batch.analyze_many"""
+        from batch import analyze_many
+        return analyze_many(paths, workers=workers, cache_path=cache_path, taxonomy_path=taxonomy_path)
 
-    def get_cover_letter_suggestions(self, job_role, match_percentage, missing_skills, achievements):
-        """Generate specific suggestions for improving the cover letter"""
+    @instrumented(sized=False)
+    def get_cover_letter_suggestions(self, job_role, analysis):
+        """Generate specific suggestions for improving the cover letter from a ResumeAnalysis"""
         suggestions = []
+        match_percentage, missing_skills, _ = analysis.job_match(job_role) if job_role in self.job_roles else (0, [], [])
+        achievements = analysis.achievements
         
         # Match percentage based suggestions
         if match_percentage < 50:
@@ -574,13 +387,40 @@ class ResumeAnalyzer:
         
         return suggestions
 
+@lru_cache(maxsize=None)
+def get_analyzer(taxonomy_path=None, **options):
+    """Process-wide shared ResumeAnalyzer, built once per taxonomy and options"""
+    taxonomy = load_taxonomy(taxonomy_path) if taxonomy_path else None
+    analyzer = ResumeAnalyzer(taxonomy, **options)
+    # Warm derived state now so the first request does not pay for it
+    analyzer.vocabulary_version
+    analyzer.taxonomy.role_matrix
+    return analyzer
+
+def time_stages(analyzer, data, extension):
+    """Stage records of extracting and fully analyzing one file from scratch"""
+    with instrumentation.collect(force=True) as trace:
+        analyzer.analyze_text(analyzer.extract_text_from_bytes(data, extension))
+    return trace
+
+
 def main():
+    import streamlit as st
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
     st.set_page_config(page_title="Resume Analyzer", page_icon="📄", layout="wide")
     
     st.title("📄 Resume Analyzer")
     st.markdown("Upload your resume to get detailed analysis and insights!")
     
-    analyzer = ResumeAnalyzer()
+    # Opt-in per-stage timings of the current document only (see instrumentation.py)
+    show_timings = st.sidebar.checkbox("🛠️ Show stage timings", help="Time each extraction and analysis stage")
+    
+    # Long PDFs are extracted across all cores; short ones stay on the serial path.
+    # The analyzer is shared by every session and rerun instead of rebuilt each time.
+    analyzer = st.cache_resource(get_analyzer)(pdf_workers=os.cpu_count())
     
     # File upload
     uploaded_file = st.file_uploader(
@@ -590,13 +430,25 @@ def main():
     )
     
     if uploaded_file is not None:
-        # Extract text based on file type
-        if uploaded_file.type == "application/pdf":
-            text = analyzer.extract_text_from_pdf(uploaded_file)
-        elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            text = analyzer.extract_text_from_docx(uploaded_file)
-        else:  # txt file
-            text = str(uploaded_file.read(), "utf-8")
+        def extract_uploaded_text():
+            # Extract text based on file type
+            if uploaded_file.type == "application/pdf":
+                return analyzer.extract_text_from_pdf(uploaded_file)
+            elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+                return analyzer.extract_text_from_docx(uploaded_file)
+            else:  # txt file
+                return str(uploaded_file.getvalue(), "utf-8")
+        
+        # Reruns reuse the memoized analysis; known uploads are served from the cache,
+        # and an edited re-upload only re-analyzes the paragraphs that changed
+        cache = AnalysisCache()
+        file_bytes = uploaded_file.getvalue()
+        incremental = st.session_state.setdefault('incremental', IncrementalAnalyzer(analyzer))
+        analysis = st.session_state.get('analysis')
+        if analysis is None or analysis.key != file_key(file_bytes):
+            analysis = cache.load_analysis(file_bytes, analyzer, extract_uploaded_text, analyze=incremental.analyze)
+            st.session_state['analysis'] = analysis
+        text = analysis.text
         
         if text:
             # Create tabs for different analyses
@@ -612,15 +464,14 @@ def main():
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    st.metric("Word Count", len(text.split()))
+                    st.metric("Word Count", analysis.word_count)
                 
                 with col2:
                     st.metric("Character Count", len(text))
                 
                 with col3:
                     # Calculate resume score
-                    skills = analyzer.extract_skills(text)
-                    score = analyzer.calculate_resume_score(text, skills)
+                    score = analysis.score
                     st.metric("Resume Score", f"{score}/100")
                 
                 with col4:
@@ -658,7 +509,7 @@ def main():
             with tab2:
                 st.header("Skills Analysis")
                 
-                skills = analyzer.extract_skills(text)
+                skills = analysis.skills
                 
                 # Technical skills
                 st.subheader("Technical Skills")
@@ -693,7 +544,7 @@ def main():
             with tab3:
                 st.header("Contact Information")
                 
-                contact_info = analyzer.extract_contact_info(text)
+                contact_info = analysis.contacts
                 
                 if contact_info['emails']:
                     st.subheader("📧 Email Addresses")
@@ -716,7 +567,7 @@ def main():
             with tab4:
                 st.header("Word Frequency Analysis")
                 
-                word_freq = analyzer.get_word_frequency(text)
+                word_freq = analysis.word_freq
                 
                 if word_freq:
                     # Top 20 words
@@ -742,6 +593,20 @@ def main():
             with tab5:
                 st.header("Job Role Matching")
                 
+                # Best roles across the whole taxonomy
+                st.subheader("🏆 Best Roles for This Resume")
+                best_roles = analyzer.rank_job_roles(analysis.skills, top_k=5)
+                best_roles_df = pd.DataFrame([
+                    {
+                        'Role': match['role'],
+                        'Match %': round(match['match_percentage'], 1),
+                        'Matched Skills': ', '.join(match['matched_skills']),
+                        'Missing Skills': ', '.join(match['missing_skills'])
+                    }
+                    for match in best_roles
+                ])
+                st.dataframe(best_roles_df, use_container_width=True, hide_index=True)
+                
                 # Job role selection
                 st.subheader("Select Target Job Role")
                 selected_job = st.selectbox(
@@ -757,7 +622,7 @@ def main():
                     st.write(f"**Key Skills Required:** {', '.join(job_info['key_skills'])}")
                     
                     # Calculate match
-                    match_percentage, missing_skills, matched_skills = analyzer.calculate_job_match(skills, selected_job)
+                    match_percentage, missing_skills, matched_skills = analysis.job_match(selected_job)
                     
                     # Display match results
                     col1, col2 = st.columns(2)
@@ -801,6 +666,17 @@ def main():
                             for skill in missing_skills[:3]:  # Top 3 missing skills
                                 st.write(f"🎯 Learn {skill}")
                     
+                    # Description similarity
+                    st.subheader("📄 Job Description Similarity")
+                    job_description = st.text_area(
+                        "Paste a job description (leave empty to compare against the role's industry keywords):",
+                        key="job_description"
+                    )
+                    similarity = analyzer.calculate_description_similarity(
+                        analysis.word_freq, job_description or analyzer.role_keywords_text(selected_job)
+                    )
+                    st.metric("Description Similarity", f"{similarity:.1f}%")
+                    
                     # Key responsibilities
                     st.subheader("Key Responsibilities")
                     for responsibility in job_info['responsibilities']:
@@ -814,7 +690,7 @@ def main():
                 
                 with col1:
                     # Extract name from resume
-                    extracted_name = analyzer.extract_name_from_resume(text)
+                    extracted_name = analysis.name
                     user_name = st.text_input("Your Name", value=extracted_name)
                 
                 with col2:
@@ -829,26 +705,29 @@ def main():
                 
                 # Additional customization options
                 st.subheader("📝 Customization Options")
+                letter_templates = load_letter_templates()
                 col1, col2 = st.columns(2)
                 
                 with col1:
                     tone = st.selectbox(
                         "Cover Letter Tone:",
-                        ["Professional", "Enthusiastic", "Confident", "Analytical"]
+                        list(letter_templates.tones)
                     )
                 
                 with col2:
                     focus_area = st.selectbox(
                         "Primary Focus:",
-                        ["Technical Skills", "Leadership Experience", "Problem Solving", "Innovation", "Team Collaboration"]
+                        list(letter_templates.focuses)
                     )
                 
-                # Generate cover letter button
+                # Generate cover letter button; remembered so the template buttons below survive reruns
                 if st.button("🚀 Generate Enhanced Cover Letter", type="primary"):
+                    st.session_state.cover_letter_requested = True
+                if st.session_state.get('cover_letter_requested'):
                     if user_name and company_name and cover_letter_job:
                         # Generate cover letter
                         cover_letter = analyzer.generate_cover_letter(
-                            user_name, cover_letter_job, company_name, skills, text
+                            user_name, cover_letter_job, company_name, analysis, tone=tone, focus=focus_area
                         )
                         
                         # Display cover letter
@@ -867,9 +746,9 @@ def main():
                         st.subheader("📊 Cover Letter Analysis")
                         
                         # Get match analysis
-                        match_percentage, missing_skills, matched_skills = analyzer.calculate_job_match(skills, cover_letter_job)
-                        achievements = analyzer.extract_quantifiable_achievements(text)
-                        years_experience = analyzer.extract_years_of_experience(text)
+                        match_percentage, missing_skills, matched_skills = analysis.job_match(cover_letter_job)
+                        achievements = analysis.achievements
+                        years_experience = analysis.experience_years
                         
                         # Metrics
                         col1, col2, col3, col4 = st.columns(4)
@@ -889,9 +768,7 @@ def main():
                         
                         # Personalized suggestions
                         st.subheader("💡 Personalized Cover Letter Suggestions")
-                        suggestions = analyzer.get_cover_letter_suggestions(
-                            cover_letter_job, match_percentage, missing_skills, achievements
-                        )
+                        suggestions = analyzer.get_cover_letter_suggestions(cover_letter_job, analysis)
                         
                         for suggestion in suggestions:
                             st.markdown(suggestion)
@@ -962,10 +839,9 @@ def main():
                         st.subheader("📋 Alternative Cover Letter Templates")
                         
                         template_options = {
-                            "Technical Focus": "Emphasizes technical skills and project experience",
-                            "Leadership Focus": "Highlights management and team leadership experience", 
-                            "Results Focus": "Concentrates on measurable achievements and impact",
-                            "Growth Focus": "Emphasizes learning agility and career progression"
+                            template: layout['description']
+                            for template, layout in letter_templates.templates.items()
+                            if template != DEFAULT_TEMPLATE
                         }
                         
                         for template, description in template_options.items():
@@ -973,8 +849,25 @@ def main():
                                 st.write(f"**Focus:** {description}")
                                 st.write("**Best for:** Candidates who want to emphasize this particular strength")
                                 if st.button(f"Generate {template}", key=f"template_{template}"):
-                                    # This would generate different variations - simplified for example
-                                    st.write("💡 This would generate a cover letter with adjusted focus and tone")
+                                    # Selected tone with the template's own focus
+                                    alternative = analyzer.generate_cover_letter(
+                                        user_name, cover_letter_job, company_name, analysis, tone=tone, template=template
+                                    )
+                                    st.text_area(f"{template} Cover Letter", alternative, height=400,
+                                                 key=f"template_letter_{template}")
+                        
+                        # Side-by-side comparison with the selected tone and focus, rendered in one pass
+                        if st.checkbox("🔀 Compare all templates side by side", key="compare_templates"):
+                            variants = analyzer.compare_cover_letters(
+                                user_name, cover_letter_job, company_name, analysis, tones=[tone], focuses=[focus_area]
+                            )
+                            st.caption(f"Tone: {tone} · Focus: {focus_area}")
+                            columns = st.columns(len(variants))
+                            for column, ((_, _, template), letter) in zip(columns, variants.items()):
+                                with column:
+                                    st.markdown(f"**{template}**")
+                                    st.text_area(template, letter, height=500, key=f"compare_letter_{template}",
+                                                 label_visibility="collapsed")
                         
                     else:
                         st.warning("Please fill in all required fields (Name, Company, Job Role)")
@@ -1027,7 +920,7 @@ def main():
             recommendations = []
             
             # Check contact info
-            contact_info = analyzer.extract_contact_info(text)
+            contact_info = analysis.contacts
             if not contact_info['emails']:
                 recommendations.append("✉️ Add an email address to your resume")
             if not contact_info['phones']:
@@ -1036,6 +929,7 @@ def main():
                 recommendations.append("💼 Add your LinkedIn profile URL")
             
             # Check skills
+            skills = analysis.skills
             total_skills = sum(len(skills_list) for skills_list in skills['technical'].values())
             if total_skills < 5:
                 recommendations.append("🔧 Add more technical skills relevant to your field")
@@ -1044,14 +938,14 @@ def main():
                 recommendations.append("🤝 Include more soft skills (leadership, communication, etc.)")
             
             # Check resume length
-            word_count = len(text.split())
+            word_count = analysis.word_count
             if word_count < 200:
                 recommendations.append("📝 Your resume seems short. Consider adding more details about your experience")
             elif word_count > 800:
                 recommendations.append("✂️ Your resume might be too long. Consider condensing it")
             
             # Check for quantifiable achievements
-            achievements = analyzer.extract_quantifiable_achievements(text)
+            achievements = analysis.achievements
             if not achievements:
                 recommendations.append("📊 Add quantifiable achievements with specific numbers or percentages")
             
@@ -1081,6 +975,36 @@ def main():
             
             for tip in pro_tips:
                 st.write(f"💡 {tip}")
+        
+        if show_timings:
+            with st.expander("🛠️ Stage Timings", expanded=True):
+                # Timed on a fresh, uncached run so every stage shows up
+                timings = st.session_state.setdefault('stage_timings', {})
+                if analysis.key not in timings or st.button("⏱️ Re-run timings"):
+                    extension = {
+                        "application/pdf": ".pdf",
+                        "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+                    }.get(uploaded_file.type, ".txt")
+                    timings[analysis.key] = time_stages(analyzer, file_bytes, extension)
+                
+                rows = [
+                    {
+                        'Stage': name,
+                        'Calls': totals['calls'],
+                        'Wall ms': round(totals['wall_seconds'] * 1000, 3),
+                        'CPU ms': round(totals['cpu_seconds'] * 1000, 3),
+                        'KB in': round(totals.get('bytes', 0) / 1024, 1),
+                        'Pages': totals.get('pages'),
+                        'Sentences': totals.get('sentences'),
+                        'Tokens': totals.get('tokens'),
+                    }
+                    for name, totals in instrumentation.summarize(timings[analysis.key]).items()
+                ]
+                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+                st.caption("Stages nest: a stage's time includes the stages it calls.")
+        
+        # Persist whatever this run computed so the next upload of this file skips it
+        cache.save_analysis(analysis)
     
     else:
         st.info("👆 Please upload a resume file to get started!")
@@ -0,0 +1,257 @@
+"""Headless batch analysis of resume files using a process pool.
+
+Usage:
+    python batch.py resumes/ extra.pdf --workers 8 --output results.jsonl
+    python batch.py resumes/ --output results.parquet
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import instrumentation
+from app import get_analyzer
+from cache import DEFAULT_CACHE_PATH, AnalysisCache
+from export import DEFAULT_ROW_GROUP_SIZE, open_sink
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Files submitted to the pool ahead of completion, per worker
+MAX_QUEUED_PER_WORKER = 4
+
+# One analyzer (and optional cache) per worker process, built by the pool initializer;
+# service.py's pool uses the same initializer
+_worker_analyzer = None
+_worker_cache = None
+
+
+def _make_analyzer(taxonomy_path=None):
+    return get_analyzer(taxonomy_path)
+
+
+def init_worker(cache_path=None, taxonomy_path=None, metrics=False):
+    """Process pool initializer; ``metrics`` times stages for the parent to export"""
+    global _worker_analyzer, _worker_cache
+    if metrics:
+        instrumentation.enable(export=False)
+    _worker_analyzer = _make_analyzer(taxonomy_path)
+    _worker_cache = AnalysisCache(cache_path) if cache_path else None
+
+
+def worker_analyzer():
+    """This worker's analyzer, or the shared one outside a pool"""
+    return _worker_analyzer or get_analyzer()
+
+
+def worker_cache():
+    """This worker's AnalysisCache, or None when caching is off"""
+    return _worker_cache
+
+
+def analyze_file(path, analyzer=None, cache=None, top_words=20, fields=None):
+    """Extract and analyze a single resume file, never raising"""
+    analyzer = analyzer or worker_analyzer()
+    cache = cache or worker_cache()
+    started = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        extension = os.path.splitext(path)[1]
+        if cache is not None:
+            analysis = cache.load_analysis(data, analyzer, lambda: analyzer.extract_text_from_bytes(data, extension))
+        else:
+            analysis = analyzer.analyze(analyzer.extract_text_from_bytes(data, extension))
+        if not analysis.text.strip():
+            raise ValueError("No text could be extracted")
+        result = analyzer.analyze_text(analysis.text, top_words=top_words, analysis=analysis, fields=fields)
+        if cache is not None:
+            cache.save_analysis(analysis)
+        result.update({'path': path, 'ok': True, 'error': None})
+    except Exception as e:
+        result = {'path': path, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def analyze_many(paths, workers=None, on_result=None, cache_path=None, taxonomy_path=None, top_words=20,
+                 fields=None, keep_results=True):
+    """Analyze resume files across a process pool.
+
+    Returns ``(results, report)`` where results are in input order and a
+    failing file yields an ``ok=False`` entry instead of aborting the batch.
+    ``on_result`` is called with each result as soon as it completes, and
+    ``cache_path`` enables the persistent AnalysisCache for known files and
+    ``taxonomy_path`` loads a custom skill/role taxonomy in every worker.
+    ``top_words=None`` keeps each document's full word frequency list and
+    ``fields`` limits the work to the listed result fields.
+
+    Only a few files per worker are in flight at a time, and with
+    ``keep_results=False`` results are handed to ``on_result`` and dropped
+    (``results`` is None), so memory stays flat however many files are given.
+
+    If a worker process dies (killed, out of memory), the pool is rebuilt and
+    the files it lost are retried one at a time; only a file that kills its
+    worker while running alone is reported as failed.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(paths) if keep_results else None
+    succeeded = 0
+    started = time.perf_counter()
+
+    def record(i, result):
+        nonlocal succeeded
+        succeeded += bool(result['ok'])
+        if keep_results:
+            results[i] = result
+        if on_result:
+            on_result(result)
+
+    if workers == 1 or len(paths) <= 1:
+        analyzer = _make_analyzer(taxonomy_path)
+        cache = AnalysisCache(cache_path) if cache_path else None
+        for i, path in enumerate(paths):
+            record(i, analyze_file(path, analyzer, cache, top_words, fields))
+    else:
+        def new_pool():
+            return ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(cache_path, taxonomy_path))
+
+        executor = new_pool()
+        queued = iter(range(len(paths)))
+        retry = deque()  # Files lost when a worker died
+        futures = {}
+        alone = None  # Retried file running without other files in flight
+
+        def submit(i):
+            try:
+                future = executor.submit(analyze_file, paths[i], None, None, top_words, fields)
+            except BrokenProcessPool as e:
+                future = Future()
+                future.set_exception(e)
+            futures[future] = i
+
+        def fill():
+            nonlocal alone
+            if retry:
+                # Retried files run alone, so another crash points at the file that caused it
+                if not futures:
+                    alone = retry.popleft()
+                    submit(alone)
+                return
+            alone = None
+            while len(futures) < workers * MAX_QUEUED_PER_WORKER:
+                i = next(queued, None)
+                if i is None:
+                    return
+                submit(i)
+
+        try:
+            fill()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                broken = any(isinstance(future.exception(), BrokenProcessPool) for future in done)
+                if broken:
+                    # Every file still in flight is lost with the pool; keep what finished first
+                    wait(futures)
+                    done = list(futures)
+                lost = []
+                for future in done:
+                    i = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as e:
+                        if i != alone:
+                            lost.append(i)
+                            continue
+                        result = {'path': paths[i], 'ok': False, 'seconds': None,
+                                  'error': f"{type(e).__name__}: worker process died analyzing this file"}
+                    except Exception as e:
+                        result = {'path': paths[i], 'ok': False, 'error': f"{type(e).__name__}: {e}", 'seconds': None}
+                    record(i, result)
+                if broken:
+                    executor.shutdown(wait=False)
+                    executor = new_pool()
+                    retry.extendleft(sorted(lost, reverse=True))
+                fill()
+        finally:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - started
+    report = {
+        'documents': len(paths),
+        'succeeded': succeeded,
+        'failed': len(paths) - succeeded,
+        'workers': workers,
+        'elapsed_seconds': elapsed,
+        'docs_per_second': len(paths) / elapsed if elapsed > 0 else 0.0
+    }
+    return results, report
+
+
+def collect_paths(inputs):
+    """Expand files and directories into a sorted list of supported resume files"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in files:
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        paths.append(os.path.join(root, name))
+        else:
+            paths.append(item)
+    return sorted(paths)
+
+
+def format_report(report):
+    return (f"Analyzed {report['documents']} documents "
+            f"({report['succeeded']} ok, {report['failed']} failed) "
+            f"in {report['elapsed_seconds']:.2f}s with {report['workers']} workers: "
+            f"{report['docs_per_second']:.1f} docs/sec")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze resume files in bulk")
+    parser.add_argument('inputs', nargs='+', help="Resume files or directories (PDF, DOCX, TXT)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', default='-',
+                        help="Output file: Parquet for *.parquet, JSON Lines otherwise (default: JSON Lines on stdout)")
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help="Results per Parquet row group")
+    parser.add_argument('--fields', default=None,
+                        help="Comma-separated result fields to compute (default: all), e.g. skills,score")
+    parser.add_argument('--taxonomy', default=None, help="Skill/role taxonomy file (JSON or YAML)")
+    parser.add_argument('--cache', action='store_true', help="Reuse cached results for files seen before")
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help="SQLite cache location")
+    args = parser.parse_args(argv)
+
+    paths = collect_paths(args.inputs)
+    failures = []
+    with open_sink(args.output, _make_analyzer(args.taxonomy).taxonomy, row_group_size=args.row_group_size) as sink:
+        def write_result(result):
+            sink.write(result)
+            if not result['ok']:
+                failures.append(result)
+
+        # Results stream straight to the sink instead of accumulating in memory
+        _, report = analyze_many(
+            paths,
+            workers=args.workers,
+            on_result=write_result,
+            cache_path=args.cache_path if args.cache else None,
+            taxonomy_path=args.taxonomy,
+            fields=args.fields.split(',') if args.fields else None,
+            keep_results=False
+        )
+
+    print(format_report(report), file=sys.stderr)
+    for result in failures:
+        print(f"  {result['path']}: {result['error']}", file=sys.stderr)
+    return 0 if report['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
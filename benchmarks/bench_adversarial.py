@@ -0,0 +1,110 @@
+"""Extraction time on adversarial inputs, to catch super-linear regex behaviour.
+
+Each case is a malformed or hostile "resume" (no sentence punctuation, endless
+dotted or comma-grouped runs, e-mail and phone look-alikes) generated at
+growing sizes. Time should grow linearly with size; a case whose largest size
+exceeds the budget fails the run:
+
+    python -m benchmarks.bench_adversarial --sizes 10000 100000 1000000 --budget 5
+    python -m benchmarks.bench_adversarial --legacy   # also time the former per-pattern regexes
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+
+from benchmarks.bench_scanner import legacy_extract
+from benchmarks.corpus import resume_lines
+from scanner import scan_text
+
+
+def _repeat(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+CASES = {
+    'no punctuation': lambda size: _repeat(" ".join(resume_lines(50)).replace('.', ' ') + " ", size),
+    'action, no amount': lambda size: _repeat("increased revenue and improved the platform ", size),
+    'dotted word': lambda size: _repeat("a.", size),
+    'hyphenated word': lambda size: _repeat("a-", size),
+    'e-mail local part': lambda size: _repeat("a.", size - 1) + "@",
+    'e-mail domain': lambda size: "x@" + _repeat("a.", size - 2),
+    'e-mail both sides': lambda size: _repeat("a.", size // 2) + "@" + _repeat("b.", size // 2),
+    'at signs': lambda size: _repeat("a@", size),
+    'thousands groups': lambda size: "1" + _repeat(",000", size - 1),
+    'digit run': lambda size: _repeat("1", size),
+    'phone look-alikes': lambda size: _repeat("+1 (555) 12-34 ", size),
+    'decimal run': lambda size: _repeat("1.", size),
+    'dollar run': lambda size: _repeat("$1,000,00", size),
+    'whitespace years': lambda size: "5" + _repeat(" ", size - 7) + "years",
+    'ragged line breaks': lambda size: _repeat("a\n \t \n\r\n ", size),
+    'linkedin path': lambda size: "linkedin.com/in/" + _repeat("a-", size - 16),
+}
+
+
+def time_call(fn, text):
+    started = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - started
+
+
+def _timed_child(fn, text, queue):
+    queue.put(time_call(fn, text))
+
+
+def time_call_bounded(fn, text, timeout):
+    """Time fn(text) in a child process, returning None if it runs past timeout"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_timed_child, args=(fn, text, queue))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return None
+    return queue.get()
+
+
+def format_seconds(seconds):
+    return f"{'timeout':>10}" if seconds is None else f"{seconds * 1000:>10.1f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--budget', type=float, default=5.0,
+                        help="Seconds allowed for the largest size of each case (default: 5)")
+    parser.add_argument('--legacy', action='store_true',
+                        help="Also time the former per-pattern regexes, each bounded by the budget")
+    args = parser.parse_args(argv)
+
+    extractors = [('scanner', scan_text)]
+    if args.legacy:
+        extractors.append(('legacy', legacy_extract))
+
+    header = "".join(f"{size:>9}ch" for size in args.sizes)
+    print(f"{'case (ms)':<20} {'engine':<8}{header}  {'growth':>7}")
+    failures = []
+    for name, build in CASES.items():
+        texts = [build(size) for size in args.sizes]
+        for engine, fn in extractors:
+            if engine == 'scanner':
+                timings = [time_call(fn, text) for text in texts]
+            else:
+                timings = [time_call_bounded(fn, text, args.budget) for text in texts]
+            # Time ratio between the largest and smallest size, per unit of size ratio: ~1 is linear
+            growth = ""
+            if timings[0] and timings[-1] and len(timings) > 1:
+                growth = f"{(timings[-1] / timings[0]) / (args.sizes[-1] / args.sizes[0]):>6.1f}x"
+            print(f"{name:<20} {engine:<8}" + "".join(format_seconds(t) for t in timings) + f"  {growth:>7}")
+            if engine == 'scanner' and timings[-1] > args.budget:
+                failures.append(name)
+
+    if failures:
+        print(f"Over the {args.budget:g}s budget: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Memory held by analysis results: computed_fields() dicts vs CompactCorpus records.
+
+Every resume of a synthetic corpus is analyzed in full and only its results
+are kept; the tracemalloc size of what is kept is reported per resume and
+projected to 100k resumes:
+
+    python -m benchmarks.bench_compact --documents 2000 --lines 80
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.corpus import resume_lines
+from compact import CompactCorpus
+
+PROJECTED_DOCUMENTS = 100_000
+
+
+def analyzed_fields(analyzer, text):
+    analysis = analyzer.analyze(text)
+    for field in ('skills', 'contacts', 'word_freq', 'achievements', 'experience_years', 'score'):
+        getattr(analysis, field)
+    return analysis.computed_fields()
+
+
+def retained_bytes(build):
+    """Bytes still allocated once build() has returned, along with its result"""
+    tracemalloc.start()
+    try:
+        started = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        return tracemalloc.get_traced_memory()[0] - started, kept
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, default=2000)
+    parser.add_argument('--lines', type=int, default=80, help="Lines per resume")
+    parser.add_argument('--skill-density', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    from app import get_analyzer
+    analyzer = get_analyzer()
+    texts = ["\n".join(resume_lines(args.lines, args.skill_density, seed, analyzer.taxonomy))
+             for seed in range(args.documents)]
+    analyzed_fields(analyzer, texts[0])  # Warm analyzer caches so they are not billed to either side
+
+    dict_bytes, results = retained_bytes(lambda: [analyzed_fields(analyzer, text) for text in texts])
+    del results
+
+    def build_compact():
+        corpus = CompactCorpus(analyzer)
+        for text in texts:
+            corpus.add(analyzed_fields(analyzer, text))
+        return corpus
+    compact_bytes, corpus = retained_bytes(build_compact)
+
+    started = time.perf_counter()
+    for fields in corpus:
+        pass
+    unpack_seconds = time.perf_counter() - started
+
+    print(f"{'representation':<16} {'bytes/resume':>13} {'MB per 100k':>12}")
+    for label, size in (('dicts', dict_bytes), ('compact', compact_bytes)):
+        per_resume = size / args.documents
+        print(f"{label:<16} {per_resume:>13.0f} {per_resume * PROJECTED_DOCUMENTS / 1e6:>12.0f}")
+    print(f"{dict_bytes / compact_bytes:.1f}x smaller; unpacking all {args.documents} records took "
+          f"{unpack_seconds * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
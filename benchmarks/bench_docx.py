@@ -0,0 +1,91 @@
+"""Streaming OOXML extraction vs the python-docx object model, by document size.
+
+Documents come from benchmarks.corpus with a header and a skills table added,
+the places python-docx's ``document.paragraphs`` does not reach:
+
+    python -m benchmarks.bench_docx --lines 100 1000 10000
+"""
+import argparse
+import time
+import tracemalloc
+from io import BytesIO
+
+from benchmarks.corpus import resume_lines
+from extraction import iter_docx_paragraphs
+
+TABLE_ROWS = [
+    ("Languages", "Python, Java, SQL"),
+    ("Cloud", "AWS, Docker, Kubernetes"),
+]
+
+
+def resume_docx(line_count):
+    """DOCX resume with a header, a skills table and line_count body paragraphs"""
+    import docx
+    document = docx.Document()
+    lines = resume_lines(line_count)
+    document.sections[0].header.paragraphs[0].text = lines[0]
+    table = document.add_table(rows=len(TABLE_ROWS), cols=2)
+    for row, cells in zip(table.rows, TABLE_ROWS):
+        for cell, value in zip(row.cells, cells):
+            cell.text = value
+    for line in lines[1:]:
+        document.add_paragraph(line)
+    out = BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def python_docx_text(data):
+    """The former extraction path: body paragraphs of the full object model"""
+    import docx
+    document = docx.Document(BytesIO(data))
+    text = ""
+    for paragraph in document.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def streamed_text(data):
+    return "".join(paragraph + "\n" for paragraph in iter_docx_paragraphs(BytesIO(data), max_chars=None))
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def peak_kb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'lines':>7} {'docx ms':>9} {'stream ms':>10} {'speedup':>8} "
+          f"{'docx KB':>9} {'stream KB':>10} {'docx chars':>11} {'stream chars':>13}")
+    for line_count in args.lines:
+        data = resume_docx(line_count)
+        legacy, legacy_text = best_of(args.repeat, lambda: python_docx_text(data))
+        streamed, text = best_of(args.repeat, lambda: streamed_text(data))
+        missing = set(legacy_text.splitlines()) - set(text.splitlines())
+        assert not missing, f"streaming extraction lost paragraphs: {sorted(missing)[:3]}"
+        print(f"{line_count:>7} {legacy * 1000:>9.1f} {streamed * 1000:>10.1f} {legacy / streamed:>7.2f}x "
+              f"{peak_kb(lambda: python_docx_text(data)):>9.0f} {peak_kb(lambda: streamed_text(data)):>10.0f} "
+              f"{len(legacy_text):>11} {len(text):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Serial vs parallel PDF page extraction by page count.
+
+    python -m benchmarks.bench_pdf_pages --workers 4 --pages 4 8 16 32 64 128
+"""
+import argparse
+import os
+import time
+from io import BytesIO
+
+from benchmarks.corpus import resume_pdf
+from extraction import extract_pdf_pages_parallel, iter_pdf_pages, join_pages
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--pages', type=int, nargs='+', default=[4, 8, 16, 32, 64, 128])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    # Warm the pool so process start-up is not billed to the first row
+    extract_pdf_pages_parallel(resume_pdf(2), args.workers, max_pages=None, max_chars=None, max_seconds=None)
+
+    print(f"{'pages':>6} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+    for page_count in args.pages:
+        data = resume_pdf(page_count)
+        serial, serial_text = best_of(args.repeat, lambda: join_pages(
+            iter_pdf_pages(BytesIO(data), max_pages=None, max_chars=None, max_seconds=None)))
+        parallel, parallel_text = best_of(args.repeat, lambda: join_pages(extract_pdf_pages_parallel(
+            data, args.workers, max_pages=None, max_chars=None, max_seconds=None)))
+        assert serial_text == parallel_text, "parallel extraction changed the text"
+        print(f"{page_count:>6} {serial * 1000:>10.1f} {parallel * 1000:>12.1f} {serial / parallel:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
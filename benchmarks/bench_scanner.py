@@ -0,0 +1,75 @@
+"""Fused single-pass scanner vs the former per-call, per-sentence regexes.
+
+    python -m benchmarks.bench_scanner --lines 100 1000 10000 100000
+"""
+import argparse
+import re
+import time
+
+from benchmarks.corpus import resume_lines
+from scanner import scan_text
+
+CONTACT_LINES = [
+    "Jane Doe - jane.doe@example.com - +1 (555) 123-4567 - linkedin.com/in/jane-doe",
+    "Over 8 years of experience in backend development.",
+]
+
+
+def legacy_extract(text):
+    """The extraction methods as they were: string patterns compiled on demand, one pass each"""
+    contacts = {
+        'emails': re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text),
+        'phones': re.findall(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text),
+        'linkedin': re.findall(r'linkedin\.com/in/[\w-]+', text.lower()),
+    }
+
+    achievements = []
+    number_patterns = [
+        r'\b(\d+(?:\.\d+)?%)\b',
+        r'\b(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:users?|customers?|clients?|projects?|applications?|systems?)\b',
+        r'\b(?:increased?|improved?|reduced?|decreased?|saved?|generated?|managed?|led?)\s+.*?(\d+(?:\.\d+)?%)\b',
+        r'\b(?:increased?|improved?|reduced?|decreased?|saved?|generated?)\s+.*?(\$\d+(?:,\d{3})*(?:\.\d+)?[kmb]?)\b'
+    ]
+    for sentence in re.split(r'[.!?]+', text):
+        for pattern in number_patterns:
+            if re.findall(pattern, sentence.lower()):
+                clean_sentence = sentence.strip()
+                if len(clean_sentence) > 20 and len(clean_sentence) < 200:
+                    achievements.append(clean_sentence)
+                    break
+
+    years = []
+    for pattern in [r'(\d+)\+?\s*years?\s*(?:of\s*)?experience', r'(\d+)\+?\s*years?\s*in',
+                    r'over\s*(\d+)\s*years?', r'more\s*than\s*(\d+)\s*years?']:
+        years.extend(int(match) for match in re.findall(pattern, text.lower()))
+
+    return contacts, list(set(achievements)), max(years) if years else 0
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lines', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'lines':>7} {'chars':>10} {'legacy ms':>10} {'fused ms':>9} {'speedup':>8} {'achievements':>13}")
+    for line_count in args.lines:
+        text = "\n".join(CONTACT_LINES + resume_lines(line_count))
+        legacy, (_, legacy_achievements, legacy_years) = best_of(args.repeat, lambda: legacy_extract(text))
+        fused, result = best_of(args.repeat, lambda: scan_text(text))
+        assert max(result['years'], default=0) == legacy_years, "experience years differ"
+        print(f"{line_count:>7} {len(text):>10} {legacy * 1000:>10.1f} {fused * 1000:>9.1f} "
+              f"{legacy / fused:>7.2f}x {len(legacy_achievements):>6} / {len(result['achievements']):<6}")
+
+
+if __name__ == "__main__":
+    main()
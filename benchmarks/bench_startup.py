@@ -0,0 +1,88 @@
+"""Cold-start time of the headless entry points and the Streamlit server.
+
+Every measurement runs in a fresh interpreter, with and without
+RESUME_ANALYZER_OFFLINE=1 (bundled stopwords/tokenizer, no NLTK):
+
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import app': "import app",
+    'batch CLI --help': "import sys; sys.argv = ['batch.py', '--help']\n"
+                        "import batch\ntry:\n    batch.main()\nexcept SystemExit:\n    pass",
+    'first analysis': "import app; app.ResumeAnalyzer().analyze_text('Python developer, 5 years of experience')",
+    'UI imports': "import app, streamlit, pandas, plotly.express, plotly.graph_objects",
+}
+
+
+def time_command(args, env, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(args, cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_streamlit_server(env, repeat, timeout=60):
+    """Seconds from launching `streamlit run app.py` until its health check answers"""
+    timings = []
+    for _ in range(repeat):
+        port = free_port()
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', 'app.py', '--server.headless', 'true',
+             '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            while time.perf_counter() - started < timeout:
+                try:
+                    with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1):
+                        break
+                except OSError:
+                    time.sleep(0.05)
+            timings.append(time.perf_counter() - started)
+        finally:
+            process.terminate()
+            process.wait()
+    return timings
+
+
+def report(name, mode, timings):
+    print(f"{name:<22} {mode:<8} median {statistics.median(timings) * 1000:8.0f} ms"
+          f"   min {min(timings) * 1000:8.0f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-streamlit', action='store_true', help="Do not launch the Streamlit server")
+    args = parser.parse_args(argv)
+
+    for mode, offline in (('default', ''), ('offline', '1')):
+        env = dict(os.environ, RESUME_ANALYZER_OFFLINE=offline)
+        for name, code in SCENARIOS.items():
+            report(name, mode, time_command([sys.executable, '-c', code], env, args.repeat))
+        if not args.skip_streamlit:
+            report('streamlit server', mode, time_streamlit_server(env, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
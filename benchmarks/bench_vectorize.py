@@ -0,0 +1,61 @@
+"""Corpus word statistics: per-document Counters vs one document-term matrix.
+
+Both sides compute every document's top 20 words, the corpus top 20 and
+document frequencies over a synthetic corpus:
+
+    python -m benchmarks.bench_vectorize --documents 100 1000 5000
+"""
+import argparse
+import time
+from collections import Counter
+
+from benchmarks.corpus import resume_lines
+from vectorize import corpus_top_k, document_frequency, top_terms_per_document
+
+
+def counter_stats(analyzer, texts):
+    """The former way: a Counter per document, merged in Python"""
+    frequencies = [analyzer.get_word_frequency(text) for text in texts]
+    per_document = [frequency.most_common(20) for frequency in frequencies]
+    totals = Counter()
+    documents = Counter()
+    for frequency in frequencies:
+        totals.update(frequency)
+        documents.update(frequency.keys())
+    return per_document, totals.most_common(20), documents
+
+
+def matrix_stats(analyzer, texts):
+    matrix, vocabulary = analyzer.word_count_matrix(texts)
+    return top_terms_per_document(matrix, vocabulary), corpus_top_k(matrix, vocabulary), document_frequency(matrix)
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--lines', type=int, default=80, help="Lines per resume")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    from app import get_analyzer
+    analyzer = get_analyzer()
+    print(f"{'documents':>10} {'counters ms':>12} {'matrix ms':>10} {'speedup':>8}")
+    for count in args.documents:
+        texts = ["\n".join(resume_lines(args.lines, seed=seed, taxonomy=analyzer.taxonomy)) for seed in range(count)]
+        counters, (per_document, _, _) = best_of(args.repeat, lambda: counter_stats(analyzer, texts))
+        matrix, (matrix_per_document, _, _) = best_of(args.repeat, lambda: matrix_stats(analyzer, texts))
+        assert [[n for _, n in top] for top in per_document] == [[n for _, n in top] for top in matrix_per_document]
+        print(f"{count:>10} {counters * 1000:>12.1f} {matrix * 1000:>10.1f} {counters / matrix:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
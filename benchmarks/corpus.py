@@ -0,0 +1,147 @@
+"""Synthetic resume corpus of configurable size and skill density.
+
+Resumes get a contact header, a years-of-experience summary, bullet lines
+with quantified achievements and body text in which roughly ``skill_density``
+of the words are taxonomy skills. Each one can be rendered as TXT, DOCX or PDF.
+Write a corpus to disk with:
+
+    python -m benchmarks.corpus corpus/ --count 100 --lines 80 --skill-density 0.1 --formats txt docx pdf
+"""
+import argparse
+import os
+import random
+from io import BytesIO
+
+FORMATS = ('txt', 'docx', 'pdf')
+
+FILLER_WORDS = (
+    "designed delivered owned maintained reviewed planned scaled migrated automated documented "
+    "platform service pipeline feature release customer team roadmap system quality workflow "
+    "reliable secure internal external cross functional high quality daily weekly quarterly "
+    "with for across using on the a and of to in by"
+).split()
+
+ACHIEVEMENTS = [
+    "Increased conversion by {pct}% across {count} customers",
+    "Reduced infrastructure cost by ${money}k in one year",
+    "Improved build times by {pct}% for {count} projects",
+    "Saved ${money}k annually by automating manual reporting",
+]
+
+LINES_PER_PDF_PAGE = 60
+
+
+def resume_lines(line_count, skill_density=0.1, seed=0, taxonomy=None, words_per_line=14):
+    """Deterministic lines of one synthetic resume"""
+    if taxonomy is None:
+        from taxonomy import load_taxonomy
+        taxonomy = load_taxonomy()
+    rng = random.Random(seed)
+    skills = list(taxonomy.aliases)
+    lines = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com | +1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)} | "
+        f"linkedin.com/in/candidate-{seed}",
+        f"Engineer with {rng.randint(1, 20)} years of experience.",
+        "",
+    ]
+    while len(lines) < line_count:
+        if rng.random() < 0.2:
+            line = "- " + rng.choice(ACHIEVEMENTS).format(
+                pct=rng.randint(5, 80), count=rng.randint(2, 400), money=rng.randint(10, 900)) + "."
+        else:
+            words = [rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER_WORDS)
+                     for _ in range(words_per_line)]
+            line = " ".join(words).capitalize() + "."
+        lines.append(line)
+    return lines[:line_count]
+
+
+def docx_bytes(lines):
+    """DOCX document with one paragraph per line"""
+    import docx
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    out = BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_bytes(pages):
+    """Minimal valid PDF with one Helvetica text block per page of lines"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages)))}] "
+        f"/Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, lines in enumerate(pages):
+        stream = ("BT /F1 9 Tf 11 TL 40 800 Td "
+                  + " ".join(f"({_pdf_escape(line)}) '" for line in lines) + " ET").encode('latin-1', 'replace')
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def render(lines, file_format):
+    """Bytes of a resume in the given format"""
+    if file_format == 'txt':
+        return ("\n".join(lines) + "\n").encode('utf-8')
+    if file_format == 'docx':
+        return docx_bytes(lines)
+    if file_format == 'pdf':
+        return pdf_bytes([lines[i:i + LINES_PER_PDF_PAGE] for i in range(0, len(lines), LINES_PER_PDF_PAGE)])
+    raise ValueError(f"Unsupported format: {file_format}")
+
+
+def resume_pdf(page_count, seed=0, taxonomy=None):
+    """PDF of one synthetic resume filling page_count pages"""
+    return render(resume_lines(page_count * LINES_PER_PDF_PAGE, seed=seed, taxonomy=taxonomy), 'pdf')
+
+
+def generate(count, line_count=80, skill_density=0.1, formats=FORMATS, seed=0, taxonomy=None):
+    """Yield (name, format, bytes) for count resumes in each format"""
+    for i in range(count):
+        lines = resume_lines(line_count, skill_density, seed + i, taxonomy)
+        for file_format in formats:
+            yield f"resume_{seed + i:05d}.{file_format}", file_format, render(lines, file_format)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output', help="Directory to write the corpus to")
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--lines', type=int, default=80, help="Lines per resume")
+    parser.add_argument('--skill-density', type=float, default=0.1, help="Fraction of body words that are skills")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    written = 0
+    for name, _, data in generate(args.count, args.lines, args.skill_density, args.formats, args.seed):
+        with open(os.path.join(args.output, name), 'wb') as f:
+            f.write(data)
+        written += 1
+    print(f"Wrote {written} files to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
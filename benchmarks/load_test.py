@@ -0,0 +1,138 @@
+"""Concurrent load against the HTTP analysis service.
+
+Sends synthetic resumes to an endpoint at a fixed concurrency and reports
+latency percentiles, throughput and status codes (503s show backpressure).
+With --spawn the service is started locally on a free port first:
+
+    python -m benchmarks.load_test --spawn --requests 200 --concurrency 16
+    python -m benchmarks.load_test --url http://127.0.0.1:8080 --endpoint /match --format pdf
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import aiohttp
+
+from benchmarks.bench_startup import ROOT, free_port
+from benchmarks.corpus import resume_lines, resume_pdf
+
+ENDPOINT_OPTIONS = {
+    '/analyze': {},
+    '/match': {'role': 'Data Scientist'},
+    '/cover-letter': {'job_role': 'Data Scientist', 'company': 'Acme'},
+}
+
+
+def make_payloads(file_format, count, lines):
+    """Distinct resumes, so the service cannot answer from its cache"""
+    if file_format == 'pdf':
+        return [('file', resume_pdf(max(1, lines // 60), seed=seed), 'application/pdf') for seed in range(count)]
+    return [('text', "\n".join(resume_lines(lines, seed=seed)), None) for seed in range(count)]
+
+
+async def send(session, url, options, payload):
+    kind, body, content_type = payload
+    started = time.perf_counter()
+    if kind == 'text':
+        response = await session.post(url, json=dict(options, text=body))
+    else:
+        form = aiohttp.FormData(options)
+        form.add_field('file', body, filename='resume.pdf', content_type=content_type)
+        response = await session.post(url, data=form)
+    async with response:
+        await response.read()
+    return response.status, time.perf_counter() - started
+
+
+async def run_load(url, options, payloads, requests, concurrency):
+    statuses = Counter()
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(payloads[i % len(payloads)])
+
+    async def client(session):
+        while not queue.empty():
+            payload = queue.get_nowait()
+            try:
+                status, seconds = await send(session, url, options, payload)
+            except aiohttp.ClientError as e:
+                statuses[type(e).__name__] += 1
+                continue
+            statuses[status] += 1
+            if status == 200:
+                latencies.append(seconds)
+
+    started = time.perf_counter()
+    timeout = aiohttp.ClientTimeout(total=None)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+    return statuses, latencies, time.perf_counter() - started
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1] if len(values) > 1 else values[0]
+
+
+async def wait_healthy(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(base_url + '/health') as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Service at {base_url} did not become healthy")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=None, help="Base URL of a running service")
+    parser.add_argument('--spawn', action='store_true', help="Start service.py locally for the run")
+    parser.add_argument('--service-args', default='', help="Extra arguments for the spawned service")
+    parser.add_argument('--endpoint', choices=sorted(ENDPOINT_OPTIONS), default='/analyze')
+    parser.add_argument('--format', choices=['text', 'pdf'], default='text')
+    parser.add_argument('--lines', type=int, default=60, help="Lines per synthetic resume")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    if not args.url and not args.spawn:
+        parser.error("pass --url or --spawn")
+
+    process = None
+    base_url = args.url
+    if args.spawn:
+        port = free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        process = subprocess.Popen([sys.executable, 'service.py', '--port', str(port)] + args.service_args.split(),
+                                   cwd=ROOT, env=dict(os.environ), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_healthy(base_url))
+        payloads = make_payloads(args.format, min(args.requests, 50), args.lines)
+        statuses, latencies, elapsed = asyncio.run(run_load(
+            base_url + args.endpoint, ENDPOINT_OPTIONS[args.endpoint], payloads, args.requests, args.concurrency))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(f"{args.requests} requests to {args.endpoint} ({args.format}) at concurrency {args.concurrency} "
+          f"in {elapsed:.2f}s: {args.requests / elapsed:.1f} req/s")
+    print("status codes: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items(), key=str)))
+    if latencies:
+        print(f"latency ms: p50 {percentile(latencies, 50) * 1000:.1f}  p90 {percentile(latencies, 90) * 1000:.1f}  "
+              f"p99 {percentile(latencies, 99) * 1000:.1f}  max {max(latencies) * 1000:.1f}")
+    return 0 if statuses.get(200) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Per-stage benchmark of ResumeAnalyzer over a synthetic corpus, with baselines.
+
+Every stage runs on every document of a generated corpus (see
+benchmarks/corpus.py). The report has latency percentiles, throughput in
+documents and input megabytes per second, and the tracemalloc peak of a
+single call. Results can be saved as a named baseline under
+benchmarks/baselines/ and later runs compared against it; a stage whose
+median slows down by more than --threshold is reported as a regression and
+makes the run exit non-zero:
+
+    python -m benchmarks.run --save default
+    python -m benchmarks.run --compare default --threshold 0.2
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+from itertools import count as counter
+
+from benchmarks.corpus import generate
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+JOB_ROLE = 'Data Scientist'
+
+
+def build_cases(analyzer, count, line_count, skill_density, seed):
+    """Corpus texts plus the per-stage (input bytes, call) pairs to time"""
+    documents = {}
+    for name, file_format, data in generate(count, line_count, skill_density, seed=seed, taxonomy=analyzer.taxonomy):
+        documents.setdefault(name.rsplit('.', 1)[0], {})[file_format] = data
+
+    stages = {name: [] for name in (
+        'extract_text_from_pdf', 'extract_text_from_docx', 'extract_skills', 'extract_contact_info',
+        'extract_quantifiable_achievements', 'get_word_frequency', 'calculate_job_match', 'generate_cover_letter',
+    )}
+    for files in documents.values():
+        text = files['txt'].decode('utf-8')
+        size = len(files['txt'])
+        skills = analyzer.extract_skills(text)
+        analysis = analyzer.analyze(text)
+        # Cover letters are timed on their own, not on the extraction they trigger
+        analysis.job_match(JOB_ROLE)
+        analysis.achievements
+        analysis.experience_years
+
+        stages['extract_text_from_pdf'].append(
+            (len(files['pdf']), lambda data=files['pdf']: analyzer.extract_text_from_pdf(BytesIO(data))))
+        stages['extract_text_from_docx'].append(
+            (len(files['docx']), lambda data=files['docx']: analyzer.extract_text_from_docx(BytesIO(data))))
+        stages['extract_skills'].append((size, lambda text=text: analyzer.extract_skills(text)))
+        stages['extract_contact_info'].append((size, lambda text=text: analyzer.extract_contact_info(text)))
+        stages['extract_quantifiable_achievements'].append(
+            (size, lambda text=text: analyzer.extract_quantifiable_achievements(text)))
+        stages['get_word_frequency'].append((size, lambda text=text: analyzer.get_word_frequency(text)))
+        stages['calculate_job_match'].append(
+            (size, lambda skills=skills: analyzer.calculate_job_match(skills, JOB_ROLE)))
+        # A new company on every call, so letters are rendered instead of served from the letter cache
+        stages['generate_cover_letter'].append(
+            (size, lambda analysis=analysis, calls=counter(): analyzer.generate_cover_letter(
+                'Candidate', JOB_ROLE, f"Company {next(calls)}", analysis)))
+    return stages
+
+
+def percentile(values, q):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+def measure(cases, repeat):
+    """Latency percentiles, throughput and peak memory of one stage"""
+    timings = []
+    for _ in range(repeat):
+        for _, call in cases:
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+
+    # Peak memory is measured in a separate pass, tracing slows every call down
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _, call in cases:
+            tracemalloc.reset_peak()
+            call()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    total = sum(timings)
+    input_bytes = sum(size for size, _ in cases) * repeat
+    result = {
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p90_ms': percentile(timings, 90) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'docs_per_sec': len(timings) / total if total else 0.0,
+        'mb_per_sec': input_bytes / total / 1e6 if total else 0.0,
+        'peak_kb': peak / 1024,
+    }
+    return {key: round(value, 4) for key, value in result.items()}
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def compare(stages, baseline, threshold):
+    """Print median changes against a baseline and return the regressed stages"""
+    regressions = []
+    print(f"\n{'stage':<34} {'baseline p50':>13} {'p50':>9} {'change':>8}")
+    for stage, result in stages.items():
+        before = baseline['stages'].get(stage)
+        if before is None:
+            continue
+        change = result['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{stage:<34} {before['p50_ms']:>13.3f} {result['p50_ms']:>9.3f} {change:>+7.0%}{flag}")
+        if flag:
+            regressions.append(stage)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=20, help="Resumes in the corpus")
+    parser.add_argument('--lines', type=int, default=120, help="Lines per resume")
+    parser.add_argument('--skill-density', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--stages', nargs='+', default=None, help="Only run these stages")
+    parser.add_argument('--save', metavar='NAME', help="Save the results as benchmarks/baselines/NAME.json")
+    parser.add_argument('--compare', metavar='NAME', help="Compare against benchmarks/baselines/NAME.json")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Median slowdown reported as a regression (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    from app import get_analyzer
+    analyzer = get_analyzer()
+    cases = build_cases(analyzer, args.count, args.lines, args.skill_density, args.seed)
+    if args.stages:
+        cases = {stage: cases[stage] for stage in args.stages}
+
+    stages = {}
+    print(f"{'stage':<34} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'docs/s':>9} {'MB/s':>8} {'peak KB':>9}")
+    for stage, stage_cases in cases.items():
+        result = stages[stage] = measure(stage_cases, args.repeat)
+        print(f"{stage:<34} {result['p50_ms']:>9.3f} {result['p90_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+              f"{result['docs_per_sec']:>9.1f} {result['mb_per_sec']:>8.2f} {result['peak_kb']:>9.1f}")
+
+    parameters = {'count': args.count, 'lines': args.lines, 'skill_density': args.skill_density,
+                  'seed': args.seed, 'repeat': args.repeat}
+    status = 0
+    if args.compare:
+        with open(baseline_path(args.compare), encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['parameters'] != parameters:
+            print(f"Note: baseline was recorded with {baseline['parameters']}", file=sys.stderr)
+        regressions = compare(stages, baseline, args.threshold)
+        if regressions:
+            print(f"Regressed beyond {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            status = 1
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        baseline = {
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'parameters': parameters,
+            'stages': stages,
+        }
+        with open(baseline_path(args.save), 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline {baseline_path(args.save)}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Persistent, content-addressed cache of extracted resume text and analysis results.
+
+Entries are keyed by the SHA-256 of the uploaded file's bytes and tagged with
+the analyzer's vocabulary version, so re-uploading a known resume skips
+parsing entirely while edits to the skill/keyword lists invalidate old results.
+Entries hold the text plus whichever ResumeAnalysis results have been computed
+for it; results computed later are merged in on the next save.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+
+from analysis import ResumeAnalysis
+from extraction import deadline_watch
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    'RESUME_ANALYZER_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'resume_analyzer', 'analysis.sqlite3')
+)
+
+# Bump when the shape or meaning of cached payloads changes
+CACHE_FORMAT = 7
+
+
+def file_key(data):
+    """Content address of a file's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=5000, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used)")
+
+    @contextmanager
+    def _connect(self):
+        # A fresh connection per operation keeps the cache safe to share between
+        # Streamlit script threads and batch worker processes.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key, version):
+        """Return the cached payload for key, or None if missing or stale"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT version, payload FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[0] != version:
+                conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE analyses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return _decode(row[1])
+
+    def put(self, key, version, payload):
+        blob = _encode(payload)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, version, payload, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, version, blob, len(blob), time.time())
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the cache is within its bounds"""
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM analyses ORDER BY last_used ASC"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM analyses WHERE key = ?", doomed)
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM analyses")
+
+    def load_analysis(self, data, analyzer, extract_text, analyze=None):
+        """Return a ResumeAnalysis for a file, seeded with any cached results.
+
+        ``extract_text`` is only called on a miss and should return the file's
+        text; ``analyze`` (default ``analyzer.analyze``) turns it into an
+        analysis, e.g. IncrementalAnalyzer.analyze. Call ``save_analysis``
+        afterwards to persist newly computed results.
+        """
+        key = file_key(data)
+        entry = self.get(key, _version(analyzer))
+        if entry is not None:
+            text = entry.pop('text')
+            analysis = ResumeAnalysis(analyzer, text, precomputed=entry, key=key)
+        else:
+            with deadline_watch() as deadline_hits:
+                text = extract_text()
+            analysis = (analyze or analyzer.analyze)(text)
+            analysis.key = key
+            analysis.truncated = bool(deadline_hits)
+        analysis.saved_fields = set(entry or ())
+        return analysis
+
+    def save_analysis(self, analysis):
+        """Persist the analysis if it computed anything not yet cached.
+
+        Empty text (a failed parse) and text cut short by the extraction time
+        budget are never cached.
+        """
+        fields = analysis.computed_fields()
+        if not analysis.text or analysis.truncated or set(fields) <= analysis.saved_fields:
+            return
+        self.put(analysis.key, _version(analysis.analyzer), dict(fields, text=analysis.text))
+        analysis.saved_fields = set(fields)
+
+
+def _version(analyzer):
+    return f"{CACHE_FORMAT}:{analyzer.vocabulary_version}"
+
+
+def _encode(payload):
+    payload = dict(payload)
+    if 'word_freq' in payload:
+        payload['word_freq'] = list(payload['word_freq'].items())
+    return zlib.compress(json.dumps(payload).encode('utf-8'))
+
+
+def _decode(blob):
+    payload = json.loads(zlib.decompress(blob).decode('utf-8'))
+    if 'word_freq' in payload:
+        payload['word_freq'] = Counter(dict(payload['word_freq']))
+    return payload
@@ -0,0 +1,110 @@
+"""Compact in-memory records of analysis results for large corpora.
+
+A ResumeAnalysis holds its results as nested dicts of lists and a Counter of
+word strings, which costs tens of kilobytes per resume. CompactCorpus keeps
+the same results in ``__slots__`` records instead:
+
+* skills as one bitset over the taxonomy's skill ids;
+* contacts and achievements as tuples, empty ones shared;
+* word counts as one uint32 array of (term id, count) pairs over a
+  vocabulary shared by the whole corpus;
+* experience years and score as plain ints.
+
+``unpack`` rebuilds exactly the dicts, lists and Counter that
+``ResumeAnalysis.computed_fields()`` returned, including the order of the
+Counter, so ties in ``most_common`` come out the same.
+"""
+from collections import Counter
+
+import numpy as np
+
+from similarity import Vocabulary
+
+CONTACT_FIELDS = ('emails', 'phones', 'linkedin')
+
+
+class CompactRecord:
+    """Results of one resume; a field that was never computed is None"""
+
+    __slots__ = ('key', 'skill_bits', 'emails', 'phones', 'linkedin', 'achievements', 'experience_years', 'score',
+                 'words')
+
+    def __init__(self, key=None):
+        self.key = key
+        self.skill_bits = None
+        self.emails = None
+        self.phones = None
+        self.linkedin = None
+        self.achievements = None
+        self.experience_years = None
+        self.score = None
+        self.words = None  # uint32 array of shape (2, distinct words): term ids, counts
+
+
+class CompactCorpus:
+    """Compact records of many resumes analyzed by one analyzer"""
+
+    def __init__(self, analyzer, vocabulary=None):
+        self.analyzer = analyzer
+        self.vocabulary = Vocabulary() if vocabulary is None else vocabulary
+        self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.unpack(self.records[index])
+
+    def __iter__(self):
+        return map(self.unpack, self.records)
+
+    def add(self, fields, key=None):
+        """Pack computed_fields() of an analysis and keep the record"""
+        record = self.pack(fields, key)
+        self.records.append(record)
+        return record
+
+    def pack(self, fields, key=None):
+        """CompactRecord for a dict shaped like ResumeAnalysis.computed_fields()"""
+        record = CompactRecord(key)
+        skills = fields.get('skills')
+        if skills is not None:
+            names = [skill for category_skills in skills['technical'].values() for skill in category_skills]
+            names.extend(skills['soft'])
+            record.skill_bits = self.analyzer.taxonomy.skills_bitset(names)
+        contacts = fields.get('contacts')
+        if contacts is not None:
+            for field in CONTACT_FIELDS:
+                setattr(record, field, tuple(contacts[field]))
+        if fields.get('achievements') is not None:
+            record.achievements = tuple(fields['achievements'])
+        record.experience_years = fields.get('experience_years')
+        record.score = fields.get('score')
+        word_freq = fields.get('word_freq')
+        if word_freq is not None:
+            words = np.empty((2, len(word_freq)), dtype=np.uint32)
+            words[0] = [self.vocabulary.add(term) for term in word_freq]
+            words[1] = list(word_freq.values())
+            record.words = words
+        return record
+
+    def unpack(self, record):
+        """The computed_fields() dict a record was packed from"""
+        fields = {}
+        if record.skill_bits is not None:
+            skill_ids = [self.analyzer.taxonomy.skill_ids[skill]
+                         for skill in self.analyzer.taxonomy.skills_from_bitset(record.skill_bits)]
+            fields['skills'] = self.analyzer.group_skills(skill_ids)
+        if record.emails is not None:
+            fields['contacts'] = {field: list(getattr(record, field)) for field in CONTACT_FIELDS}
+        if record.words is not None:
+            terms = self.vocabulary.terms
+            fields['word_freq'] = Counter(dict(zip(map(terms.__getitem__, record.words[0].tolist()),
+                                                   record.words[1].tolist())))
+        if record.achievements is not None:
+            fields['achievements'] = list(record.achievements)
+        if record.experience_years is not None:
+            fields['experience_years'] = record.experience_years
+        if record.score is not None:
+            fields['score'] = record.score
+        return fields
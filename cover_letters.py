@@ -0,0 +1,250 @@
+"""Cover letters rendered from tone, focus and layout templates compiled once per resume.
+
+Letter text lives in ``data/cover_letter_templates.json``:
+
+* ``fragments``: the Professional wording of every part of a letter;
+* ``tones``: per-tone replacements for any of those fragments;
+* ``focuses``: an optional paragraph emphasizing one strength;
+* ``paragraphs``: the fragments making up each paragraph, some only when
+  a condition holds (e.g. ``years_experience`` when experience was found);
+* ``templates``: the order of paragraphs in each layout, with the focus it
+  uses when none is given.
+
+Fragments are parsed once per process (load_letter_templates). Everything
+that depends only on the resume and the job role (matched skills,
+experience, achievements, industry keywords, skills to grow) is filled in
+the first time a (role, tone, focus, template) combination is used,
+compiling it into literal text and named slots. Rendering a letter for
+another company only fills the slots and joins the pieces.
+
+Phrase choices (opening hook, value proposition, company benefit) are drawn
+from a seed: a hash of the resume fingerprint, name, role, company and
+variant number. The same inputs therefore always give the same letter, in any
+process, and rendered letters can be cached. Pass a different ``variant`` to
+draw other phrases for the same company and role. Tone, focus and template
+do not change the phrases, so ``render_variants`` output can be compared
+side by side.
+"""
+import hashlib
+import json
+import os
+import string
+from functools import lru_cache
+from itertools import product
+
+DEFAULT_TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data',
+                                      'cover_letter_templates.json')
+
+DEFAULT_TONE = 'Professional'
+DEFAULT_TEMPLATE = 'Standard'
+
+INVALID_ROLE_LETTER = "Invalid job role selected."
+
+DEFAULT_MAX_CACHED_LETTERS = 1024
+
+# Filled per letter; every other field is filled when a combination is compiled
+LETTER_SLOTS = frozenset({'opening_hook', 'value_proposition', 'company_benefit', 'company', 'name'})
+COMPILED_FIELDS = frozenset({
+    'job_role', 'job_role_lower', 'top_skills', 'matched_skills', 'match_percentage', 'years_experience',
+    'industry_keywords', 'missing_skills', 'achievement_bullets', 'responsibility_bullets',
+})
+CONDITIONS = frozenset({'years_experience', 'matched_skills', 'achievements', 'no_achievements', 'missing_skills'})
+
+
+class CompiledLetter:
+    """Literal text interleaved with named slots; literals has one item more than slots"""
+
+    def __init__(self):
+        self.literals = [""]
+        self.slots = []
+
+    def text(self, value):
+        self.literals[-1] += value
+
+    def slot(self, name):
+        self.slots.append(name)
+        self.literals.append("")
+
+    def render(self, values):
+        pieces = [self.literals[0]]
+        for name, literal in zip(self.slots, self.literals[1:]):
+            pieces.append(values[name])
+            pieces.append(literal)
+        return "".join(pieces)
+
+
+def _parse_fragment(text, where):
+    """(literal, field or None) pairs of a fragment, checking its field names"""
+    parts = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(text):
+        if field is not None and (format_spec or conversion or field not in LETTER_SLOTS | COMPILED_FIELDS):
+            raise ValueError(f"Unknown field '{{{field}}}' in cover letter fragment {where}")
+        parts.append((literal, field))
+    return parts
+
+
+class LetterTemplates:
+    """Parsed tone, focus and layout templates"""
+
+    def __init__(self, data):
+        base = {key: _parse_fragment(text, key) for key, text in data['fragments'].items()}
+        self.tones = {}
+        for tone, overrides in data['tones'].items():
+            fragments = dict(base)
+            fragments.update({key: _parse_fragment(text, f"{tone}/{key}") for key, text in overrides.items()})
+            self.tones[tone] = fragments
+        self.focuses = {focus: _parse_fragment(text, focus) for focus, text in data['focuses'].items()}
+
+        self.paragraphs = {}
+        for paragraph, parts in data['paragraphs'].items():
+            entries = []
+            for part in parts:
+                part = {'fragment': part} if isinstance(part, str) else part
+                if part.get('when') is not None and part['when'] not in CONDITIONS:
+                    raise ValueError(f"Unknown condition '{part['when']}' in cover letter paragraph {paragraph}")
+                entries.append((part['fragment'], part.get('when')))
+            self.paragraphs[paragraph] = entries
+        self.templates = data['templates']
+        for template, layout in self.templates.items():
+            for paragraph in layout['paragraphs']:
+                if paragraph not in self.paragraphs:
+                    raise ValueError(f"Template '{template}' uses unknown paragraph '{paragraph}'")
+            if layout.get('focus') is not None and layout['focus'] not in self.focuses:
+                raise ValueError(f"Template '{template}' uses unknown focus '{layout['focus']}'")
+
+    def compile(self, fields, conditions, tone=DEFAULT_TONE, focus=None, template=DEFAULT_TEMPLATE):
+        """CompiledLetter of one combination for one candidate and role.
+
+        ``focus=None`` uses the template's own focus, if it has one.
+        """
+        if tone not in self.tones:
+            raise ValueError(f"Unknown cover letter tone: {tone}")
+        if template not in self.templates:
+            raise ValueError(f"Unknown cover letter template: {template}")
+        layout = self.templates[template]
+        focus = focus if focus is not None else layout.get('focus')
+        if focus is not None and focus not in self.focuses:
+            raise ValueError(f"Unknown cover letter focus: {focus}")
+
+        fragments = self.tones[tone]
+        if focus is not None:
+            fragments = dict(fragments, focus=self.focuses[focus])
+        letter = CompiledLetter()
+        for paragraph in layout['paragraphs']:
+            for fragment, when in self.paragraphs[paragraph]:
+                if (when is not None and not conditions[when]) or fragment not in fragments:
+                    continue
+                for literal, field in fragments[fragment]:
+                    letter.text(literal)
+                    if field in LETTER_SLOTS:
+                        letter.slot(field)
+                    elif field is not None:
+                        letter.text(fields[field])
+        return letter
+
+
+@lru_cache(maxsize=None)
+def load_letter_templates(path=DEFAULT_TEMPLATES_PATH):
+    """LetterTemplates from a JSON file, parsed once per process"""
+    with open(path, encoding='utf-8') as f:
+        return LetterTemplates(json.load(f))
+
+
+def letter_fields(job_role, job_info, match, achievements, years_experience):
+    """Values of the compiled fields and conditions for one candidate and role"""
+    match_percentage, missing_skills, matched_skills = match
+    fields = {
+        'job_role': job_role,
+        'job_role_lower': job_role.lower(),
+        'top_skills': ', '.join(matched_skills[:3] if matched_skills else job_info['key_skills'][:3]),
+        'matched_skills': ', '.join(matched_skills[:4]),
+        'match_percentage': f"{match_percentage:.0f}",
+        'years_experience': str(years_experience),
+        'industry_keywords': ', '.join(job_info['industry_keywords'][:3]),
+        'missing_skills': ', '.join(missing_skills[:2]),
+        'achievement_bullets': "".join(f"• {achievement.strip()}\n" for achievement in achievements[:3]),
+        'responsibility_bullets': "".join(f"• {responsibility}\n" for responsibility in job_info['responsibilities'][:3]),
+    }
+    conditions = {
+        'years_experience': years_experience > 0,
+        'matched_skills': bool(matched_skills),
+        'achievements': bool(achievements),
+        'no_achievements': not achievements,
+        'missing_skills': bool(missing_skills),
+    }
+    return fields, conditions
+
+
+class CoverLetterWriter:
+    """Cover letters for one ResumeAnalysis and candidate name, any number of companies and roles"""
+
+    def __init__(self, analysis, name, max_cached_letters=DEFAULT_MAX_CACHED_LETTERS, templates=None):
+        self.analyzer = analysis.analyzer
+        self.analysis = analysis
+        self.name = name
+        self.letter_templates = templates or load_letter_templates()
+        self.fingerprint = analysis.key or hashlib.sha256(analysis.text.encode('utf-8')).hexdigest()
+        self.roles = {}     # job role -> (fields, conditions, opening hooks)
+        self.compiled = {}  # (job role, tone, focus, template) -> CompiledLetter
+        self.render = lru_cache(maxsize=max_cached_letters)(self._render)
+
+    def _role(self, job_role):
+        role = self.roles.get(job_role)
+        if role is None:
+            job_info = self.analyzer.job_roles[job_role]
+            fields, conditions = letter_fields(job_role, job_info, self.analysis.job_match(job_role),
+                                               self.analysis.achievements, self.analysis.experience_years)
+            hooks = [hook.format(skills=fields['top_skills']) for hook in job_info['opening_hooks']]
+            role = self.roles[job_role] = (fields, conditions, hooks)
+        return role
+
+    def _compiled(self, job_role, tone, focus, template):
+        key = (job_role, tone, focus, template)
+        letter = self.compiled.get(key)
+        if letter is None:
+            fields, conditions, _ = self._role(job_role)
+            letter = self.compiled[key] = self.letter_templates.compile(fields, conditions, tone, focus, template)
+        return letter
+
+    def seed(self, company_name, job_role, variant=0):
+        """Seed of the phrase choices for one letter, stable across processes"""
+        key = "\x1f".join([self.fingerprint, self.name, job_role, company_name, str(variant)])
+        return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest(), 'big')
+
+    def _slot_values(self, company_name, job_role, variant):
+        job_info = self.analyzer.job_roles[job_role]
+        _, _, hooks = self._role(job_role)
+        seed = self.seed(company_name, job_role, variant)
+        values = {'company': company_name, 'name': self.name}
+        for slot, options in (('opening_hook', hooks), ('value_proposition', job_info['value_propositions']),
+                              ('company_benefit', job_info['company_benefits'])):
+            seed, index = divmod(seed, len(options))
+            values[slot] = options[index]
+        return values
+
+    def _render(self, company_name, job_role, variant=0, tone=DEFAULT_TONE, focus=None, template=DEFAULT_TEMPLATE):
+        if job_role not in self.analyzer.job_roles:
+            return INVALID_ROLE_LETTER
+        letter = self._compiled(job_role, tone, focus, template)
+        return letter.render(self._slot_values(company_name, job_role, variant))
+
+    def render_many(self, requests):
+        """Letters for (company, job role) or (company, job role, variant) tuples, in order"""
+        return [self.render(*request) for request in requests]
+
+    def render_variants(self, company_name, job_role, variant=0, tones=None, focuses=None, templates=None):
+        """Letters for every (tone, focus, template) combination, keyed by that tuple.
+
+        Defaults to all tones, all templates and each template's own focus
+        (``focuses=[None]``). Every letter uses the same phrase choices.
+        """
+        tones = list(self.letter_templates.tones) if tones is None else tones
+        focuses = [None] if focuses is None else focuses
+        templates = list(self.letter_templates.templates) if templates is None else templates
+        if job_role not in self.analyzer.job_roles:
+            return {combination: INVALID_ROLE_LETTER for combination in product(tones, focuses, templates)}
+        values = self._slot_values(company_name, job_role, variant)
+        return {
+            (tone, focus, template): self._compiled(job_role, tone, focus, template).render(values)
+            for tone, focus, template in product(tones, focuses, templates)
+        }
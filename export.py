@@ -0,0 +1,130 @@
+"""Streaming sinks that write batch analysis results to JSON Lines or Parquet.
+
+Both sinks take one result dict at a time (as produced by batch.analyze_file)
+and never hold more than one Parquet row group in memory, so exporting 100k
+documents costs the same memory as exporting a thousand.
+
+Parquet rows are flattened into analytics-friendly columns: one list column of
+skills per taxonomy category plus ``skills_soft``, contacts split into
+``emails``/``phones``/``linkedin``, ``job_matches`` as a role -> match
+percentage map and ``top_words`` as a list of (word, count) structs. Fields a
+batch did not compute are written as nulls.
+"""
+import json
+import sys
+
+DEFAULT_ROW_GROUP_SIZE = 1000
+
+
+class JsonlSink:
+    """Write each result as one JSON object per line; '-' writes to stdout"""
+
+    def __init__(self, path='-'):
+        self.out = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8')
+
+    def write(self, result):
+        self.out.write(json.dumps(result) + "\n")
+
+    def close(self):
+        if self.out is not sys.stdout:
+            self.out.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def result_schema(taxonomy):
+    """Arrow schema of flattened results for a taxonomy's skill categories"""
+    import pyarrow as pa
+    strings = pa.list_(pa.string())
+    fields = [
+        ('path', pa.string()),
+        ('ok', pa.bool_()),
+        ('error', pa.string()),
+        ('seconds', pa.float64()),
+        ('word_count', pa.int64()),
+        ('score', pa.int64()),
+        ('years_of_experience', pa.int64()),
+        ('emails', strings),
+        ('phones', strings),
+        ('linkedin', strings),
+        ('achievements', strings),
+    ]
+    fields += [(f'skills_{category}', strings) for category in taxonomy.technical_skills]
+    fields += [
+        ('skills_soft', strings),
+        ('job_matches', pa.map_(pa.string(), pa.float64())),
+        ('top_words', pa.list_(pa.struct([('word', pa.string()), ('count', pa.int64())]))),
+    ]
+    return pa.schema(fields)
+
+
+def flatten_result(result, taxonomy):
+    """Flatten a nested result dict into a row matching result_schema"""
+    contacts = result.get('contact_info')
+    skills = result.get('skills')
+    job_matches = result.get('job_matches')
+    top_words = result.get('top_words')
+    row = {
+        'path': result.get('path'),
+        'ok': result.get('ok'),
+        'error': result.get('error'),
+        'seconds': result.get('seconds'),
+        'word_count': result.get('word_count'),
+        'score': result.get('score'),
+        'years_of_experience': result.get('years_of_experience'),
+        'emails': contacts['emails'] if contacts else None,
+        'phones': contacts['phones'] if contacts else None,
+        'linkedin': contacts['linkedin'] if contacts else None,
+        'achievements': result.get('achievements'),
+        'skills_soft': skills['soft'] if skills else None,
+        'job_matches': list(job_matches.items()) if job_matches is not None else None,
+        'top_words': [{'word': word, 'count': count} for word, count in top_words] if top_words is not None else None,
+    }
+    for category in taxonomy.technical_skills:
+        row[f'skills_{category}'] = skills['technical'].get(category, []) if skills else None
+    return row
+
+
+class ParquetSink:
+    """Write flattened results to a Parquet file, one row group per ``row_group_size`` results"""
+
+    def __init__(self, path, taxonomy, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression='zstd'):
+        import pyarrow.parquet as pq
+        self.taxonomy = taxonomy
+        self.schema = result_schema(taxonomy)
+        self.row_group_size = row_group_size
+        self.rows = []
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression)
+
+    def write(self, result):
+        self.rows.append(flatten_result(result, self.taxonomy))
+        if len(self.rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows as one row group"""
+        import pyarrow as pa
+        if self.rows:
+            self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_sink(path, taxonomy, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """ParquetSink for *.parquet paths, JsonlSink otherwise ('-' is stdout)"""
+    if path.lower().endswith('.parquet'):
+        return ParquetSink(path, taxonomy, row_group_size=row_group_size)
+    return JsonlSink(path)
@@ -0,0 +1,283 @@
+"""Text extraction from resume files with bounded work per document."""
+import re
+import time
+import zipfile
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar
+from io import BytesIO
+
+# Budgets that keep one pathological upload from stalling a worker. The time
+# budget is checked between pages: a single page that PyPDF2 takes forever on
+# still runs to completion (serially) or keeps its pool process busy (parallel)
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_CHARS = 200_000
+DEFAULT_MAX_SECONDS = 30
+
+# Extractions stopped by their time budget inside a deadline_watch() block
+_deadline_hits = ContextVar('deadline_hits', default=None)
+
+# Below this many pages the serial path wins over shipping work to processes
+DEFAULT_PARALLEL_PAGE_THRESHOLD = 16
+
+
+@contextmanager
+def deadline_watch():
+    """Yield a list that gets an entry for every extraction in the block stopped by its time budget.
+
+    How much text such an extraction returns depends on how busy the machine
+    was, so callers should not cache it.
+    """
+    hits = []
+    token = _deadline_hits.set(hits)
+    try:
+        yield hits
+    finally:
+        _deadline_hits.reset(token)
+
+
+def _deadline_hit():
+    hits = _deadline_hits.get()
+    if hits is not None:
+        hits.append(True)
+
+
+def iter_pdf_pages(pdf_file, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                   max_seconds=DEFAULT_MAX_SECONDS):
+    """Yield the text of a PDF page by page, stopping once a budget is spent.
+
+    Pages are parsed lazily, so a consumer that stops early never pays for the
+    rest of the document. Any budget may be None to disable it; the character
+    budget truncates the last page yielded. ``max_seconds`` is checked before
+    each page, so it is exceeded by at most the time of the page in progress;
+    one page cannot be interrupted.
+    """
+    import PyPDF2
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    remaining = max_chars
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    for page_number, page in enumerate(pdf_reader.pages):
+        if max_pages is not None and page_number >= max_pages:
+            return
+        if deadline is not None and time.monotonic() > deadline:
+            _deadline_hit()
+            return
+        text = page.extract_text() or ""
+        if remaining is not None:
+            if len(text) >= remaining:
+                yield text[:remaining]
+                return
+            remaining -= len(text)
+        yield text
+
+
+def join_pages(pages):
+    """Join page texts, keeping page breaks as token boundaries"""
+    return "\n".join(pages)
+
+
+# Page-extraction pools are expensive to start, so they are shared per worker count
+_page_pools = {}
+
+
+def _page_pool(workers):
+    pool = _page_pools.get(workers)
+    if pool is None:
+        pool = _page_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+def _drop_page_pool(workers, pool):
+    """Forget a pool whose worker died so the next call starts a new one"""
+    if _page_pools.get(workers) is pool:
+        del _page_pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(data, start, stop):
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(BytesIO(data))
+    return [pdf_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def extract_pdf_pages_parallel(data, workers, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                               max_seconds=DEFAULT_MAX_SECONDS, page_count=None):
+    """Extract the pages of a PDF (given as bytes) across a process pool.
+
+    Pages are split into contiguous ranges, extracted concurrently and
+    reassembled in order. The same budgets as iter_pdf_pages apply: ranges
+    that miss the deadline are dropped, along with everything after them.
+    The caller stops waiting at the deadline, but a range already running
+    keeps its pool process busy until it finishes. If a pool process dies,
+    the pool is replaced and this document is extracted serially instead.
+    """
+    if page_count is None:
+        import PyPDF2
+        page_count = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    # Two ranges per worker balances uneven pages without copying the file too often
+    range_size = max(1, -(-page_count // (workers * 2)))
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    pool = _page_pool(workers)
+    pages = []
+    try:
+        futures = [pool.submit(_extract_page_range, data, start, min(start + range_size, page_count))
+                   for start in range(0, page_count, range_size)]
+        for future in futures:
+            try:
+                timeout = max(0, deadline - time.monotonic()) if deadline is not None else None
+                pages.extend(future.result(timeout=timeout))
+            except FutureTimeoutError:
+                for pending in futures:
+                    pending.cancel()
+                _deadline_hit()
+                break
+    except BrokenProcessPool:
+        # A page worker died (crash, out of memory): later calls get a new pool
+        _drop_page_pool(workers, pool)
+        remaining = max(0, deadline - time.monotonic()) if deadline is not None else None
+        return list(iter_pdf_pages(BytesIO(data), max_pages, max_chars, remaining))
+    return _apply_char_budget(pages, max_chars)
+
+
+def _apply_char_budget(pages, max_chars):
+    if max_chars is None:
+        return pages
+    kept = []
+    remaining = max_chars
+    for text in pages:
+        if len(text) >= remaining:
+            kept.append(text[:remaining])
+            break
+        kept.append(text)
+        remaining -= len(text)
+    return kept
+
+
+# WordprocessingML element names as reported by expat with a ' ' namespace separator;
+# transitional and strict OOXML use different namespaces for the same elements
+_W_NAMESPACES = (
+    'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'http://purl.oclc.org/ooxml/wordprocessingml/main',
+)
+_MC_FALLBACK = 'http://schemas.openxmlformats.org/markup-compatibility/2006 Fallback'
+
+
+def _w(*names):
+    return frozenset(f'{namespace} {name}' for namespace in _W_NAMESPACES for name in names)
+
+
+_W_P = _w('p')
+_W_R = _w('r')
+_W_T = _w('t')
+_RUN_CHARACTERS = {name: '\t' for name in _w('tab')}
+_RUN_CHARACTERS.update({name: '\n' for name in _w('br', 'cr')})
+_RUN_CHARACTERS.update({name: '-' for name in _w('noBreakHyphen')})
+
+_DOCX_PART = re.compile(r'word/(header|footer)(\d*)\.xml')
+
+# Compressed bytes handed to the XML parser at a time
+_DOCX_CHUNK_SIZE = 64 * 1024
+
+
+class _ParagraphCollector:
+    """Expat handlers that turn WordprocessingML events into paragraph texts.
+
+    Paragraphs nested in a paragraph (text boxes) are finished before the
+    paragraph holding them. The fallback copy of alternate content, which
+    repeats the text box of the preferred copy, is skipped.
+    """
+
+    def __init__(self):
+        self.open = []      # (text parts, run depth outside it) of unfinished paragraphs
+        self.finished = []  # paragraph texts not yet yielded
+        self.run_depth = 0
+        self.in_text = False
+        self.fallback_depth = 0
+
+    def start(self, name, attributes):
+        if self.fallback_depth:
+            if name == _MC_FALLBACK:
+                self.fallback_depth += 1
+        elif name in _W_P:
+            self.open.append(([], self.run_depth))
+            self.run_depth = 0
+        elif name in _W_R:
+            self.run_depth += 1
+        elif name in _W_T:
+            self.in_text = True
+        elif self.run_depth and self.open and name in _RUN_CHARACTERS:
+            self.open[-1][0].append(_RUN_CHARACTERS[name])
+        elif name == _MC_FALLBACK:
+            self.fallback_depth = 1
+
+    def end(self, name):
+        if self.fallback_depth:
+            if name == _MC_FALLBACK:
+                self.fallback_depth -= 1
+        elif name in _W_T:
+            self.in_text = False
+        elif name in _W_R:
+            self.run_depth -= 1
+        elif name in _W_P and self.open:
+            parts, self.run_depth = self.open.pop()
+            self.finished.append("".join(parts))
+
+    def text(self, data):
+        if self.in_text and self.open:
+            self.open[-1][0].append(data)
+
+
+def _docx_parts(archive):
+    """Text-bearing parts of a DOCX: headers, the document body, then footers"""
+    names = set(archive.namelist())
+    if 'word/document.xml' not in names:
+        raise ValueError("Not a DOCX file: word/document.xml is missing")
+    numbered = {'header': [], 'footer': []}
+    for name in names:
+        match = _DOCX_PART.fullmatch(name)
+        if match:
+            numbered[match.group(1)].append((int(match.group(2) or 0), name))
+    return ([name for _, name in sorted(numbered['header'])] + ['word/document.xml']
+            + [name for _, name in sorted(numbered['footer'])])
+
+
+def _iter_part_paragraphs(archive, name):
+    from xml.parsers import expat
+    collector = _ParagraphCollector()
+    parser = expat.ParserCreate(namespace_separator=' ')
+    parser.StartElementHandler = collector.start
+    parser.EndElementHandler = collector.end
+    parser.CharacterDataHandler = collector.text
+    parser.buffer_text = True
+    with archive.open(name) as part:
+        while True:
+            chunk = part.read(_DOCX_CHUNK_SIZE)
+            parser.Parse(chunk, not chunk)
+            yield from collector.finished
+            collector.finished.clear()
+            if not chunk:
+                return
+
+
+def iter_docx_paragraphs(docx_file, max_chars=DEFAULT_MAX_CHARS):
+    """Yield the paragraph texts of a DOCX, streamed from its zip without an object model.
+
+    Covers body paragraphs, table cells, text boxes, headers and footers; tabs
+    and line breaks inside a paragraph are kept. Like iter_pdf_pages, stops
+    once max_chars (None for no limit) have been yielded, so a consumer never
+    decompresses more of the document than it uses.
+    """
+    remaining = max_chars
+    with zipfile.ZipFile(docx_file) as archive:
+        for name in _docx_parts(archive):
+            for text in _iter_part_paragraphs(archive, name):
+                if remaining is not None:
+                    if len(text) >= remaining:
+                        yield text[:remaining]
+                        return
+                    remaining -= len(text)
+                yield text
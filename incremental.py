@@ -0,0 +1,94 @@
+"""Incremental re-analysis of edited resumes.
+
+Candidates upload, tweak a line and re-upload. IncrementalAnalyzer splits the
+text into chunks, keeps the partial results of every chunk it has seen (skill
+ids, education/experience keyword hits, word counts, contacts, experience
+years and achievement sentences) keyed by a hash of the chunk, and merges them
+into a ResumeAnalysis. After an edit only the chunks that changed are
+analyzed again.
+
+Chunks end where the scanner ends a sentence anyway, after sentence
+punctuation at a line break or at a blank line, and no scanner match spans
+a blank line, so merged results match a full analysis of the text. The one exception is a multi-word skill or
+keyword split across a chunk boundary, such as 'machine.' and 'learning' on
+separate lines, which is not matched.
+"""
+import hashlib
+import re
+from collections import Counter, OrderedDict
+
+from analysis import ResumeAnalysis
+
+CHUNK_BOUNDARY = re.compile(r'(?<=[.!?])[ \t]*\n|\n\s*\n')
+
+# Partial results kept across calls, least recently used evicted first
+DEFAULT_MAX_CHUNKS = 5000
+
+
+def split_chunks(text):
+    """Split text into the non-blank chunks that are analyzed independently"""
+    return [chunk for chunk in CHUNK_BOUNDARY.split(text) if chunk.strip()]
+
+
+def _chunk_key(chunk):
+    return hashlib.sha256(chunk.encode('utf-8')).digest()
+
+
+class IncrementalAnalyzer:
+    def __init__(self, analyzer, max_chunks=DEFAULT_MAX_CHUNKS):
+        self.analyzer = analyzer
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # chunk hash -> partial results
+        self.reused = 0    # chunks served from memory by the last analyze()
+        self.computed = 0  # chunks analyzed by the last analyze()
+
+    def _partial(self, chunk):
+        key = _chunk_key(chunk)
+        partial = self.chunks.get(key)
+        if partial is not None:
+            self.chunks.move_to_end(key)
+            self.reused += 1
+            return partial
+
+        analyzer = self.analyzer
+        partial = {
+            'skill_ids': analyzer.taxonomy.find_skill_ids(chunk),
+            'keywords': analyzer.taxonomy.keyword_matcher.find(chunk),
+            'word_freq': analyzer.get_word_frequency(chunk),
+            'scan': analyzer.scan(chunk),
+        }
+        self.chunks[key] = partial
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        self.computed += 1
+        return partial
+
+    def analyze(self, text, key=None):
+        """ResumeAnalysis of text, reusing the partial results of unchanged chunks"""
+        self.reused = self.computed = 0
+        partials = [self._partial(chunk) for chunk in split_chunks(text)]
+        analyzer = self.analyzer
+
+        skills = analyzer.group_skills(sorted({skill_id for partial in partials for skill_id in partial['skill_ids']}))
+        keywords = {keyword for partial in partials for keyword in partial['keywords']}
+        word_freq = Counter()
+        for partial in partials:
+            word_freq.update(partial['word_freq'])
+        contacts = {
+            field: [value for partial in partials for value in partial['scan'][field]]
+            for field in ('emails', 'phones', 'linkedin')
+        }
+        achievements = list(dict.fromkeys(
+            sentence for partial in partials for sentence in partial['scan']['achievements']
+        ))
+        years = [year for partial in partials for year in partial['scan']['years']]
+
+        precomputed = {
+            'skills': skills,
+            'contacts': contacts,
+            'word_freq': word_freq,
+            'achievements': achievements,
+            'experience_years': max(years) if years else 0,
+            'score': analyzer.calculate_resume_score(text, skills, contacts=contacts, keywords=keywords),
+        }
+        return ResumeAnalysis(analyzer, text, precomputed=precomputed, key=key)
@@ -0,0 +1,197 @@
+"""Opt-in per-stage timing of text extraction and analysis.
+
+When enabled (``RESUME_ANALYZER_METRICS=1`` or ``enable()``), every
+instrumented ResumeAnalyzer method records its wall time, CPU time, input size
+and item counts (pages, sentences, tokens) as a stage. Stages nest, so a
+stage's times include those of the stages it calls. Records go to three places:
+
+* process-wide totals per stage, exported by ``prometheus_text()`` (served
+  at ``/metrics`` by service.py);
+* the ``resume_analyzer.stages`` logger, one JSON object per stage at INFO;
+* the innermost ``collect()`` block, which gathers the stages of one document,
+  e.g. for the Streamlit debug panel.
+
+Worker processes call ``enable(export=False)`` and return their collected
+records, which the parent passes to ``export()``. ``collect(force=True)``
+times the stages of its own block while instrumentation stays disabled
+everywhere else, without exporting them.
+
+Disabled, an instrumented call costs one flag check and one context
+variable lookup.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger('resume_analyzer.stages')
+
+_enabled = os.environ.get('RESUME_ANALYZER_METRICS', '').lower() not in ('', '0', 'false', 'no')
+
+_export = True  # False in worker processes that ship their records to a parent
+
+_current_stage = ContextVar('current_stage', default=None)
+_current_trace = ContextVar('current_trace', default=None)
+_forced = ContextVar('forced', default=False)  # Inside a collect(force=True) block
+
+_totals = {}  # stage -> {'calls', 'wall_seconds', 'cpu_seconds', 'bytes', item: count}
+_totals_lock = threading.Lock()
+
+
+def enable(flag=True, export=True):
+    """Turn instrumentation on or off; ``export=False`` only feeds collect() blocks"""
+    global _enabled, _export
+    _enabled = flag
+    _export = export
+
+
+def is_enabled():
+    return _enabled
+
+
+def input_size(value):
+    """Size in bytes of a stage's input: text, bytes or an in-memory file"""
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    getbuffer = getattr(value, 'getbuffer', None)
+    if getbuffer is not None:
+        return getbuffer().nbytes
+    size = getattr(value, 'size', None)
+    return size if isinstance(size, int) else None
+
+
+@contextmanager
+def stage(name, bytes_in=None):
+    """Time the enclosed block as a stage; yields its record (None when disabled)"""
+    if not (_enabled or _forced.get()):
+        yield None
+        return
+    record = {'stage': name, 'bytes': bytes_in}
+    token = _current_stage.set(record)
+    wall_started = time.perf_counter()
+    cpu_started = time.thread_time()
+    try:
+        yield record
+    finally:
+        record['wall_seconds'] = time.perf_counter() - wall_started
+        record['cpu_seconds'] = time.thread_time() - cpu_started
+        _current_stage.reset(token)
+        _finish(record)
+
+
+def count(**items):
+    """Add item counts (e.g. pages=3) to the innermost running stage"""
+    record = _current_stage.get()
+    if record is not None:
+        for item, value in items.items():
+            record[item] = record.get(item, 0) + value
+
+
+def instrumented(fn=None, sized=True):
+    """Run a method (self, input, ...) as a stage named after it.
+
+    The size of the first argument is recorded as the stage's input bytes
+    unless ``sized=False`` (use ``@instrumented(sized=False)``).
+    """
+    if fn is None:
+        return functools.partial(instrumented, sized=sized)
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if not (_enabled or _forced.get()):
+            return fn(self, *args, **kwargs)
+        with stage(fn.__name__, input_size(args[0]) if sized and args else None):
+            return fn(self, *args, **kwargs)
+    return wrapper
+
+
+def _finish(record):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.append(record)
+    if _enabled and _export:
+        export([record])
+
+
+def export(records):
+    """Add stage records to the process-wide totals and the stage log, e.g. records from a worker process"""
+    with _totals_lock:
+        for record in records:
+            totals = _totals.setdefault(record['stage'], {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'bytes': 0})
+            totals['calls'] += 1
+            for key, value in record.items():
+                if key != 'stage' and value is not None:
+                    totals[key] = totals.get(key, 0) + value
+    if logger.isEnabledFor(logging.INFO):
+        for record in records:
+            logger.info(json.dumps(record))
+
+
+@contextmanager
+def collect(force=False):
+    """Gather the records of every stage finished inside the block into a list.
+
+    ``force=True`` times the block's stages even while instrumentation is
+    disabled, in this context only; those records are not exported.
+    """
+    trace = []
+    token = _current_trace.set(trace)
+    forced = _forced.set(True) if force else None
+    try:
+        yield trace
+    finally:
+        if forced is not None:
+            _forced.reset(forced)
+        _current_trace.reset(token)
+
+
+def summarize(records):
+    """Per-stage totals of a list of records, in first-seen order"""
+    summary = {}
+    for record in records:
+        totals = summary.setdefault(record['stage'], {'calls': 0})
+        totals['calls'] += 1
+        for key, value in record.items():
+            if key != 'stage' and value is not None:
+                totals[key] = totals.get(key, 0) + value
+    return summary
+
+
+def totals():
+    """Snapshot of the process-wide per-stage totals"""
+    with _totals_lock:
+        return {name: dict(values) for name, values in _totals.items()}
+
+
+def reset():
+    with _totals_lock:
+        _totals.clear()
+
+
+def prometheus_text():
+    """Process-wide totals in the Prometheus text exposition format"""
+    snapshot = totals()
+    metrics = [
+        ('calls', 'resume_analyzer_stage_calls_total', "Calls per analysis stage"),
+        ('wall_seconds', 'resume_analyzer_stage_wall_seconds_total', "Wall-clock seconds spent per stage"),
+        ('cpu_seconds', 'resume_analyzer_stage_cpu_seconds_total', "CPU seconds spent per stage"),
+        ('bytes', 'resume_analyzer_stage_input_bytes_total', "Input bytes processed per stage"),
+    ]
+    lines = []
+    for key, metric, help_text in metrics:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [f'{metric}{{stage="{name}"}} {values.get(key, 0)}' for name, values in sorted(snapshot.items())]
+
+    metric = 'resume_analyzer_stage_items_total'
+    lines += [f"# HELP {metric} Items (pages, sentences, tokens) processed per stage", f"# TYPE {metric} counter"]
+    for name, values in sorted(snapshot.items()):
+        for item, value in sorted(values.items()):
+            if item not in ('calls', 'wall_seconds', 'cpu_seconds', 'bytes'):
+                lines.append(f'{metric}{{stage="{name}",item="{item}"}} {value}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,102 @@
+"""Single-pass multi-keyword matching over resume text.
+
+Keywords are compiled into an Aho-Corasick automaton over tokens rather than
+characters: text is split once into alphanumeric runs and individual
+punctuation marks, so a keyword only ever matches whole tokens ('go' does not
+match inside 'google', 'java' does not match inside 'javascript') while
+symbols stay significant ('c++', 'c#', 'problem-solving'). Matching cost is
+linear in the length of the text regardless of how many keywords are loaded.
+"""
+import re
+from collections import deque
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+|[^\sa-z0-9]')
+
+
+def tokenize(text):
+    """Split lower-cased text into the token stream the matcher runs over"""
+    return TOKEN_PATTERN.findall(text)
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        """Compile keywords into an automaton.
+
+        ``keywords`` maps each keyword (matched case-insensitively) to the
+        value reported when it is found; several keywords, such as aliases,
+        may share a value. A plain iterable of strings reports the keywords
+        themselves.
+        """
+        if not isinstance(keywords, dict):
+            keywords = {keyword: keyword for keyword in keywords}
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [()]
+        for keyword, value in keywords.items():
+            tokens = tokenize(keyword.lower())
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][token] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append(())
+                state = next_state
+            if value not in self._outputs[state]:
+                self._outputs[state] += (value,)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit matches of the longest proper suffix
+                self._outputs[next_state] += tuple(
+                    value for value in self._outputs[self._fail[next_state]]
+                    if value not in self._outputs[next_state]
+                )
+
+    def iter_matches(self, text):
+        """Yield ``(value, token_index)`` for every keyword occurrence in text"""
+        return self.iter_stream_matches([text])
+
+    def iter_stream_matches(self, chunks):
+        """Like iter_matches, over text arriving in chunks (e.g. PDF pages).
+
+        The automaton state carries over between chunks, so each chunk is
+        consumed as it arrives and never needs to be joined with the rest; a
+        chunk boundary is treated as whitespace.
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        index = 0
+        for chunk in chunks:
+            for token in tokenize(chunk.lower()):
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+                for value in outputs[state]:
+                    yield value, index
+                index += 1
+
+    def find(self, text):
+        """Return the set of values whose keywords occur in text"""
+        return {value for value, _ in self.iter_matches(text)}
+
+    def find_in_stream(self, chunks):
+        """Return the set of values whose keywords occur in a stream of text chunks"""
+        return {value for value, _ in self.iter_stream_matches(chunks)}
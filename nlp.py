@@ -0,0 +1,74 @@
+"""Stopwords and word tokenization without import-time downloads.
+
+With ``RESUME_ANALYZER_OFFLINE=1`` the bundled English stopword list
+(``data/stopwords_english.txt``, identical to NLTK's) and a precompiled regex
+tokenizer are used and NLTK is never imported, so the process starts fast and
+never touches the network. Otherwise NLTK's corpora are used when installed,
+fetched once on first use if missing, and the bundled resources are the
+fallback when that fails.
+"""
+import os
+import re
+from functools import lru_cache
+
+OFFLINE = os.environ.get('RESUME_ANALYZER_OFFLINE', '').lower() not in ('', '0', 'false', 'no')
+
+BUNDLED_STOPWORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'stopwords_english.txt')
+
+# Alphabetic words delimited like NLTK word tokens: 'python3' and 'e-mail' yield
+# nothing (NLTK keeps them whole and they fail isalpha), "don't" yields 'don'
+# and 't' (both stopwords)
+WORD_PATTERN = re.compile(r"(?<![\w+#-])[^\W\d_]+(?![\w+#-])")
+
+
+def _nltk_resource(package, paths):
+    """Import NLTK and make sure a data package is available, downloading it if needed"""
+    import nltk
+    for path in paths:
+        try:
+            nltk.data.find(path)
+            return nltk
+        except LookupError:
+            pass
+    if not nltk.download(package, quiet=True):
+        raise LookupError(f"NLTK resource {package} is unavailable")
+    return nltk
+
+
+@lru_cache(maxsize=None)
+def english_stopwords():
+    """English stopwords as a frozenset"""
+    if not OFFLINE:
+        try:
+            _nltk_resource('stopwords', ['corpora/stopwords'])
+            from nltk.corpus import stopwords
+            return frozenset(stopwords.words('english'))
+        except (ImportError, LookupError, OSError):
+            pass
+    with open(BUNDLED_STOPWORDS_PATH, encoding='utf-8') as f:
+        return frozenset(line.strip() for line in f if line.strip())
+
+
+@lru_cache(maxsize=None)
+def _nltk_tokenizer():
+    if OFFLINE:
+        return None
+    try:
+        # Recent NLTK releases tokenize with punkt_tab, older ones with punkt
+        nltk = _nltk_resource('punkt_tab', ['tokenizers/punkt_tab', 'tokenizers/punkt'])
+        return nltk.word_tokenize
+    except (ImportError, LookupError, OSError):
+        return None
+
+
+def tokenizer_name():
+    """Which tokenizer word_tokens uses; the two disagree on e.g. 'c++' and 'node.js'"""
+    return 'nltk' if _nltk_tokenizer() is not None else 'regex'
+
+
+def word_tokens(text):
+    """Word tokens of text: NLTK's word_tokenize when available, else the bundled regex"""
+    tokenizer = _nltk_tokenizer()
+    if tokenizer is not None:
+        return tokenizer(text)
+    return WORD_PATTERN.findall(text)
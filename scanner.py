@@ -0,0 +1,121 @@
+"""Single-pass extraction of contacts, experience and achievements.
+
+Every pattern the analyzer looks for is fused into one precompiled,
+case-insensitive regex with a named group per kind of match, so a resume is
+scanned once, left to right, instead of being lower-cased, split into
+sentences and re-searched pattern by pattern. Sentence terminators are part of
+the same scan, which lets achievements be attributed to their sentence without
+a separate split; dots inside e-mail addresses, URLs and decimals are consumed
+by those matches and no longer end a sentence, while a blank line does, so a
+heading never runs into the sentence below it.
+"""
+import re
+
+# Up to five whitespace characters, never spanning a blank line (which ends a
+# sentence); within five characters a blank line is '\n', up to three spaces, '\n'
+GAP = r"(?:(?!\n[^\S\n]{0,3}\n)\s){0,5}"
+
+SCAN_PATTERN = re.compile(r"""
+    # Only the start of a word or a symbol can begin a match: rejecting every
+    # other position up front spares the engine trying each alternative there.
+    # Runs that can be re-entered from many start positions ('a.a.a...',
+    # '1,000,000,...') are length-capped, so each attempt costs a bounded
+    # number of steps and a scan stays linear in the length of the text.
+    (?:(?<!\w)(?=\w)|(?=[$+(.!?\n]))
+    (?:
+    (?P<email>\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}\b)
+  | (?P<linkedin>linkedin\.com/in/[\w-]{1,100})
+  | (?P<years>\d{1,3})\+?<gap>years?<gap>(?:(?:of<gap>)?experience|in)
+  | (?:over|more<gap>than)<gap>(?P<years_over>\d{1,3})<gap>years?
+  | \b(?P<percentage>\d{1,15}(?:\.\d{1,6})?%)
+  | \b(?P<quantity>\d{1,15}(?:,\d{3}){0,6}(?:\.\d{1,6})?)<gap>(?:users?|customers?|clients?|projects?|applications?|systems?)\b
+  | (?P<money>\$\d{1,15}(?:,\d{3}){0,6}(?:\.\d{1,6})?[kmb]?)\b
+  | (?P<phone>(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})
+  | \b(?P<action>increased?|improved?|reduced?|decreased?|saved?|generated?)(?=\s)
+  | (?P<sentence_end>[.!?]+|\n\s*\n)
+    )
+""".replace('<gap>', GAP), re.IGNORECASE | re.VERBOSE)
+
+# Kinds reported by scan(); 'action' and 'sentence_end' only drive sentence bookkeeping
+MATCH_KINDS = ('email', 'linkedin', 'years', 'percentage', 'quantity', 'money', 'phone')
+
+# Achievement sentences outside these bounds (after stripping) are ignored
+MIN_SENTENCE_CHARS = 20
+MAX_SENTENCE_CHARS = 200
+
+
+def scan(text):
+    """Yield (kind, value, start, end) for every typed match in text, in order"""
+    for match in SCAN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'years_over':
+            kind = 'years'
+        if kind in MATCH_KINDS:
+            value = match.group(match.lastgroup)
+            yield kind, value, match.start(), match.end()
+
+
+def scan_text(text):
+    """Scan text once and collect contacts, experience years, achievement sentences
+    and the number of sentences.
+
+    A sentence counts as an achievement when it mentions a percentage, a
+    number of users/clients/projects/..., or an amount of money after an
+    action verb such as 'increased' or 'saved'.
+    """
+    emails = []
+    phones = []
+    linkedin = []
+    years = []
+    achievements = {}
+
+    sentences = 0
+    sentence_start = 0
+    achieved = False
+    action_seen = False
+    for match in SCAN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'sentence_end':
+            if achieved:
+                _add_sentence(achievements, text, sentence_start, match.start())
+            if _has_text(text, sentence_start, match.start()):
+                sentences += 1
+            sentence_start = match.end()
+            achieved = action_seen = False
+        elif kind == 'email':
+            emails.append(match.group(kind))
+        elif kind == 'phone':
+            phones.append(match.group(kind))
+        elif kind == 'linkedin':
+            linkedin.append(match.group(kind).lower())
+        elif kind == 'years' or kind == 'years_over':
+            years.append(int(match.group(kind)))
+        elif kind == 'action':
+            action_seen = True
+        elif kind == 'money':
+            achieved = achieved or action_seen
+        else:  # percentage or quantity
+            achieved = True
+    if achieved:
+        _add_sentence(achievements, text, sentence_start, len(text))
+    if _has_text(text, sentence_start, len(text)):
+        sentences += 1
+
+    return {
+        'emails': emails,
+        'phones': phones,
+        'linkedin': linkedin,
+        'years': years,
+        'achievements': list(achievements),
+        'sentences': sentences,
+    }
+
+
+def _has_text(text, start, end):
+    return start < end and not text[start:end].isspace()
+
+
+def _add_sentence(sentences, text, start, end):
+    sentence = text[start:end].strip()
+    if MIN_SENTENCE_CHARS < len(sentence) < MAX_SENTENCE_CHARS:
+        sentences[sentence] = None  # dict keeps first-seen order without duplicates
@@ -0,0 +1,177 @@
+"""Reverse search: rank a corpus of analyzed resumes against a job role or description.
+
+The index keeps postings from skills and word-frequency terms to resume ids,
+so a query only touches resumes that share at least one skill or term with it
+instead of rescanning the whole corpus. Scores are computed the same way as
+``ResumeAnalyzer.calculate_job_match``.
+
+Usage:
+    python search.py index resumes/ --index resumes.idx.json
+    python search.py query --index resumes.idx.json --role "Data Scientist" --top 10
+    python search.py query --index resumes.idx.json --description job.txt
+"""
+import argparse
+import heapq
+import json
+import sys
+from collections import Counter
+
+
+class ResumeIndex:
+    def __init__(self, taxonomy):
+        self.taxonomy = taxonomy
+        self.skill_postings = {}  # skill id -> set of resume ids
+        self.term_postings = {}   # term -> {resume id: count}
+        self.resume_skills = {}   # resume id -> bitset of skill ids
+        self.resume_terms = {}    # resume id -> its terms, so removal only touches their postings
+
+    def __len__(self):
+        return len(self.resume_skills)
+
+    def add(self, resume_id, skills, word_frequency):
+        """Index a resume from extract_skills output and get_word_frequency counts"""
+        if resume_id in self.resume_skills:
+            self.remove(resume_id)
+        names = [skill for category_skills in skills['technical'].values() for skill in category_skills]
+        names.extend(skills['soft'])
+        bits = self.taxonomy.skills_bitset(names)
+        self.resume_skills[resume_id] = bits
+        for skill in self.taxonomy.skills_from_bitset(bits):
+            self.skill_postings.setdefault(self.taxonomy.skill_ids[skill], set()).add(resume_id)
+        for term, count in word_frequency.items():
+            self.term_postings.setdefault(term, {})[resume_id] = count
+        self.resume_terms[resume_id] = tuple(word_frequency)
+
+    def remove(self, resume_id):
+        bits = self.resume_skills.pop(resume_id, None)
+        if bits is None:
+            return
+        for skill in self.taxonomy.skills_from_bitset(bits):
+            self.skill_postings[self.taxonomy.skill_ids[skill]].discard(resume_id)
+        for term in self.resume_terms.pop(resume_id, ()):
+            postings = self.term_postings[term]
+            del postings[resume_id]
+            if not postings:
+                del self.term_postings[term]
+
+    def search(self, required_skills, terms=(), top_k=10):
+        """Top-k resumes for a list of required skills, tie-broken by term hits.
+
+        Each hit has the resume id, the match percentage (matched / required
+        skills, as in calculate_job_match), matched and missing skills and the
+        number of query terms the resume mentions.
+        """
+        required_skills = [skill for skill in dict.fromkeys(required_skills) if skill in self.taxonomy.skill_ids]
+        matched = Counter()
+        for skill in required_skills:
+            for resume_id in self.skill_postings.get(self.taxonomy.skill_ids[skill], ()):
+                matched[resume_id] += 1
+        term_hits = Counter()
+        for term in set(terms):
+            for resume_id in self.term_postings.get(term, ()):
+                term_hits[resume_id] += 1
+
+        candidates = sorted(set(matched) | set(term_hits), key=str)
+        best = heapq.nlargest(top_k, candidates, key=lambda resume_id: (matched[resume_id], term_hits[resume_id]))
+
+        hits = []
+        for resume_id in best:
+            bits = self.resume_skills[resume_id]
+            matched_skills = [skill for skill in required_skills if bits >> self.taxonomy.skill_ids[skill] & 1]
+            hits.append({
+                'resume_id': resume_id,
+                'match_percentage': (len(matched_skills) / len(required_skills)) * 100 if required_skills else 0,
+                'matched_skills': matched_skills,
+                'missing_skills': [skill for skill in required_skills if skill not in matched_skills],
+                'term_hits': term_hits[resume_id]
+            })
+        return hits
+
+    def search_role(self, job_role, top_k=10):
+        """Top-k resumes for one of the taxonomy's job roles"""
+        if job_role not in self.taxonomy.job_roles:
+            raise KeyError(f"Unknown job role: {job_role}")
+        job_info = self.taxonomy.job_roles[job_role]
+        terms = [term for keyword in job_info['industry_keywords'] for term in keyword.lower().split()]
+        return self.search(job_info['key_skills'], terms, top_k=top_k)
+
+    def search_description(self, analyzer, description, top_k=10):
+        """Top-k resumes for a pasted job description"""
+        skills = analyzer.extract_skills(description)
+        required_skills = [skill for category_skills in skills['technical'].values() for skill in category_skills]
+        required_skills.extend(skills['soft'])
+        return self.search(required_skills, analyzer.get_word_frequency(description), top_k=top_k)
+
+    def save(self, path):
+        data = {
+            'taxonomy_version': self.taxonomy.version,
+            'resume_skills': {resume_id: self.taxonomy.skills_from_bitset(bits)
+                              for resume_id, bits in self.resume_skills.items()},
+            'term_postings': self.term_postings
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path, taxonomy):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data['taxonomy_version'] != taxonomy.version:
+            raise ValueError("Index was built with a different taxonomy; rebuild it")
+        index = cls(taxonomy)
+        for resume_id, skills in data['resume_skills'].items():
+            bits = taxonomy.skills_bitset(skills)
+            index.resume_skills[resume_id] = bits
+            for skill in skills:
+                index.skill_postings.setdefault(taxonomy.skill_ids[skill], set()).add(resume_id)
+        index.term_postings = data['term_postings']
+        resume_terms = {resume_id: [] for resume_id in index.resume_skills}
+        for term, postings in index.term_postings.items():
+            for resume_id in postings:
+                resume_terms[resume_id].append(term)
+        index.resume_terms = {resume_id: tuple(terms) for resume_id, terms in resume_terms.items()}
+        return index
+
+
+def main(argv=None):
+    from batch import analyze_many, collect_paths
+    from app import get_analyzer
+
+    parser = argparse.ArgumentParser(description="Rank stored resumes against a job role or description")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('index', help="Analyze resume files and build an index")
+    build.add_argument('inputs', nargs='+', help="Resume files or directories")
+    build.add_argument('--index', required=True, help="Index file to write")
+    build.add_argument('--workers', type=int, default=None)
+    query = subparsers.add_parser('query', help="Query an index")
+    query.add_argument('--index', required=True, help="Index file to read")
+    target = query.add_mutually_exclusive_group(required=True)
+    target.add_argument('--role', help="Job role from the taxonomy")
+    target.add_argument('--description', help="File containing a job description")
+    query.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    analyzer = get_analyzer()
+    if args.command == 'index':
+        results, report = analyze_many(collect_paths(args.inputs), workers=args.workers, top_words=None)
+        index = ResumeIndex(analyzer.taxonomy)
+        for result in results:
+            if result['ok']:
+                index.add(result['path'], result['skills'], dict(result['top_words']))
+        index.save(args.index)
+        print(f"Indexed {len(index)} resumes into {args.index}", file=sys.stderr)
+        return 0
+
+    index = ResumeIndex.load(args.index, analyzer.taxonomy)
+    if args.role:
+        hits = index.search_role(args.role, top_k=args.top)
+    else:
+        with open(args.description, encoding='utf-8') as f:
+            hits = index.search_description(analyzer, f.read(), top_k=args.top)
+    for hit in hits:
+        print(json.dumps(hit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""Headless HTTP service for resume analysis.
+
+Usage:
+    python service.py --port 8080 --workers 4 --max-concurrency 8 --max-pending 64
+
+Endpoints (all POST, all answering JSON):
+    /analyze        analysis results; ``fields`` and ``top_words`` options
+    /match          best job roles (``top_k``), plus the match for ``role`` and
+                    the term similarity to ``description`` when given
+    /cover-letter   cover letter and suggestions for ``job_role`` at ``company``
+                    (``name`` defaults to the one found in the resume), in an
+                    optional ``tone``, ``focus`` and ``template``
+
+A resume is sent as a multipart form with a ``file`` part (PDF, DOCX or TXT)
+and the options as further form fields, as a raw file body whose
+Content-Type names its format with the options in the query string, or as a
+JSON object with the resume ``text`` and the options.
+
+Extraction and analysis run in a process pool so the event loop keeps
+accepting connections. At most ``max_concurrency`` requests occupy the pool;
+further ones wait, and once ``max_pending`` are admitted new requests are
+rejected with 503 and a Retry-After header instead of queueing without bound.
+A request that times out answers 504 but keeps its slot until its worker is
+done, and a pool whose worker died (crash, out of memory) is replaced.
+
+With ``--metrics`` every analysis stage is timed in the workers (see
+instrumentation.py) and GET /metrics serves the per-stage totals in the
+Prometheus text format; ``--stage-log`` also logs each stage as JSON.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from aiohttp import web
+
+import instrumentation
+from batch import init_worker, worker_analyzer, worker_cache
+from cache import DEFAULT_CACHE_PATH, file_key
+from cover_letters import DEFAULT_TEMPLATE, DEFAULT_TONE
+
+CONTENT_TYPE_EXTENSIONS = {
+    'application/pdf': '.pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'text/plain': '.txt',
+}
+
+DEFAULT_MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+def _load_analysis(upload):
+    """ResumeAnalysis for an uploaded (data, extension) file or plain text"""
+    analyzer = worker_analyzer()
+    cache = worker_cache()
+    data, extension, text = upload
+    if text is not None:
+        analysis = analyzer.analyze(text)
+    elif cache is not None:
+        analysis = cache.load_analysis(data, analyzer, lambda: analyzer.extract_text_from_bytes(data, extension))
+    else:
+        analysis = analyzer.analyze(analyzer.extract_text_from_bytes(data, extension))
+        analysis.key = file_key(data)
+    if not analysis.text.strip():
+        raise ValueError("No text could be extracted")
+    return analyzer, analysis
+
+
+def _traced(job, upload, *args):
+    """Run job in a worker, returning its result with the stage records it produced"""
+    with instrumentation.collect() as trace:
+        result = job(upload, *args)
+    return result, trace
+
+
+def _save_analysis(analysis):
+    cache = worker_cache()
+    if cache is not None and analysis.key is not None:
+        cache.save_analysis(analysis)
+
+
+def analyze_job(upload, fields=None, top_words=20):
+    analyzer, analysis = _load_analysis(upload)
+    result = analyzer.analyze_text(analysis.text, top_words=top_words, analysis=analysis, fields=fields)
+    _save_analysis(analysis)
+    result['key'] = analysis.key
+    return result
+
+
+def match_job(upload, role=None, description=None, top_k=5):
+    analyzer, analysis = _load_analysis(upload)
+    if role is not None and role not in analyzer.job_roles:
+        raise ValueError(f"Unknown job role: {role}")
+    result = {'key': analysis.key, 'best_roles': analyzer.rank_job_roles(analysis.skills, top_k=top_k)}
+    if role is not None:
+        match_percentage, missing_skills, matched_skills = analysis.job_match(role)
+        result['role'] = {'role': role, 'match_percentage': match_percentage,
+                          'matched_skills': matched_skills, 'missing_skills': missing_skills}
+    if description:
+        result['description_similarity'] = analyzer.calculate_description_similarity(analysis.word_freq, description)
+    _save_analysis(analysis)
+    return result
+
+
+def cover_letter_job(upload, job_role, company, name=None, tone=DEFAULT_TONE, focus=None, template=DEFAULT_TEMPLATE):
+    analyzer, analysis = _load_analysis(upload)
+    if job_role not in analyzer.job_roles:
+        raise ValueError(f"Unknown job role: {job_role}")
+    cover_letter = analyzer.generate_cover_letter(name or analysis.name, job_role, company, analysis,
+                                                  tone=tone, focus=focus, template=template)
+    result = {
+        'key': analysis.key,
+        'cover_letter': cover_letter,
+        'suggestions': analyzer.get_cover_letter_suggestions(job_role, analysis),
+    }
+    _save_analysis(analysis)
+    return result
+
+
+class ServiceState:
+    """Executor and admission control shared by every request"""
+
+    def __init__(self, make_executor, max_concurrency, max_pending, timeout):
+        self.make_executor = make_executor
+        self.executor = make_executor()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+
+    def replace_broken(self, executor):
+        """Start a new pool in place of one whose worker died; other requests may have done so already"""
+        if self.executor is executor:
+            self.executor = self.make_executor()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+STATE = web.AppKey('state', ServiceState)
+
+
+def _error(status, message, **headers):
+    return web.json_response({'error': message}, status=status, headers=headers or None)
+
+
+async def _read_upload(request):
+    """Return ((data, extension, text), options) from a multipart, raw or JSON request"""
+    content_type = request.content_type
+    if content_type == 'application/json':
+        body = await request.json()
+        if not isinstance(body, dict) or not isinstance(body.get('text'), str):
+            raise ValueError("JSON requests need a 'text' string")
+        options = {key: value for key, value in body.items() if key != 'text'}
+        return (None, None, body['text']), options
+    if content_type.startswith('multipart/'):
+        form = await request.post()
+        upload = form.get('file')
+        if not isinstance(upload, web.FileField):
+            raise ValueError("Multipart requests need a 'file' part")
+        extension = os.path.splitext(upload.filename or '')[1].lower() or CONTENT_TYPE_EXTENSIONS.get(upload.content_type)
+        if extension is None:
+            raise ValueError(f"Unsupported file type: {upload.content_type}")
+        options = {key: value for key, value in form.items() if key != 'file'}
+        return (upload.file.read(), extension, None), options
+    extension = CONTENT_TYPE_EXTENSIONS.get(content_type)
+    if extension is None:
+        raise ValueError(f"Unsupported content type: {content_type}")
+    return (await request.read(), extension, None), dict(request.query)
+
+
+async def _run(request, job, build_args):
+    """Admit a request, read it and run job in the executor, mapping failures to JSON errors"""
+    state = request.app[STATE]
+    if state.pending >= state.max_pending:
+        return _error(503, "Server busy, retry later", **{'Retry-After': '1'})
+    state.pending += 1
+    try:
+        try:
+            upload, options = await _read_upload(request)
+            args = build_args(options)
+        except (ValueError, KeyError, TypeError) as e:
+            return _error(400, str(e))
+        loop = asyncio.get_running_loop()
+        await state.semaphore.acquire()
+        executor = state.executor
+        try:
+            future = executor.submit(_traced, job, upload, *args)
+        except BrokenProcessPool as e:
+            state.semaphore.release()
+            state.replace_broken(executor)
+            return _error(503, f"{type(e).__name__}: {e}", **{'Retry-After': '1'})
+        # The slot is freed when the job is really done: after a timeout it keeps running in its worker
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(state.semaphore.release))
+        try:
+            result, stages = await asyncio.wait_for(asyncio.wrap_future(future), state.timeout)
+        except asyncio.TimeoutError:
+            return _error(504, f"Analysis took longer than {state.timeout:g}s")
+        except BrokenProcessPool as e:
+            # A worker died (crash, out of memory); the pool is unusable until replaced
+            state.replace_broken(executor)
+            return _error(422, f"{type(e).__name__}: {e}")
+        except (ValueError, KeyError) as e:
+            return _error(400, str(e))
+        except Exception as e:
+            return _error(422, f"{type(e).__name__}: {e}")
+        instrumentation.export(stages)
+        return web.json_response(result)
+    finally:
+        state.pending -= 1
+
+
+def _fields(value):
+    if value is None:
+        return None
+    return value.split(',') if isinstance(value, str) else list(value)
+
+
+def _required(options, key):
+    if not options.get(key):
+        raise ValueError(f"Missing '{key}'")
+    return options[key]
+
+
+async def analyze(request):
+    return await _run(request, analyze_job, lambda options: (
+        _fields(options.get('fields')), int(options.get('top_words', 20))))
+
+
+async def match(request):
+    return await _run(request, match_job, lambda options: (
+        options.get('role'), options.get('description'), int(options.get('top_k', 5))))
+
+
+async def cover_letter(request):
+    return await _run(request, cover_letter_job, lambda options: (
+        _required(options, 'job_role'), _required(options, 'company'), options.get('name'),
+        options.get('tone') or DEFAULT_TONE, options.get('focus') or None, options.get('template') or DEFAULT_TEMPLATE))
+
+
+async def health(request):
+    state = request.app[STATE]
+    return web.json_response({'status': 'ok', 'pending': state.pending})
+
+
+async def metrics(request):
+    return web.Response(text=instrumentation.prometheus_text(), content_type='text/plain')
+
+
+def create_app(workers=None, max_concurrency=None, max_pending=None, timeout=60, cache_path=None,
+               taxonomy_path=None, max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES, metrics_enabled=False):
+    """Build the aiohttp application and the process pool behind it"""
+    workers = workers or os.cpu_count() or 1
+    max_concurrency = max_concurrency or workers * 2
+    max_pending = max_pending or max_concurrency * 8
+    if metrics_enabled:
+        instrumentation.enable()
+    app = web.Application(client_max_size=max_upload_bytes)
+
+    def make_executor():
+        return ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                   initargs=(cache_path, taxonomy_path, metrics_enabled))
+
+    async def start(app):
+        app[STATE] = ServiceState(make_executor, max_concurrency, max_pending, timeout)
+
+    async def stop(app):
+        app[STATE].executor.shutdown(cancel_futures=True)
+
+    app.on_startup.append(start)
+    app.on_cleanup.append(stop)
+    app.add_routes([
+        web.post('/analyze', analyze),
+        web.post('/match', match),
+        web.post('/cover-letter', cover_letter),
+        web.get('/health', health),
+        web.get('/metrics', metrics),
+    ])
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume analysis over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--max-concurrency', type=int, default=None,
+                        help="Requests running in the pool at once (default: 2 per worker)")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="Requests admitted before answering 503 (default: 8x max concurrency)")
+    parser.add_argument('--timeout', type=float, default=60, help="Seconds allowed per analysis")
+    parser.add_argument('--max-upload-mb', type=float, default=DEFAULT_MAX_UPLOAD_BYTES / 1024 / 1024)
+    parser.add_argument('--taxonomy', default=None, help="Skill/role taxonomy file (JSON or YAML)")
+    parser.add_argument('--cache', action='store_true', help="Reuse cached results for files seen before")
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help="SQLite cache location")
+    parser.add_argument('--metrics', action='store_true', help="Time analysis stages and serve them at /metrics")
+    parser.add_argument('--stage-log', action='store_true', help="With --metrics, log every stage as a JSON line")
+    args = parser.parse_args(argv)
+
+    if args.stage_log:
+        logging.basicConfig(format='%(message)s')
+        instrumentation.logger.setLevel(logging.INFO)
+
+    app = create_app(
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        max_pending=args.max_pending,
+        timeout=args.timeout,
+        cache_path=args.cache_path if args.cache else None,
+        taxonomy_path=args.taxonomy,
+        max_upload_bytes=int(args.max_upload_mb * 1024 * 1024),
+        metrics_enabled=args.metrics,
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
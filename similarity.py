@@ -0,0 +1,123 @@
+"""Job-description similarity over word-frequency vectors.
+
+Resumes and job descriptions are represented by their ``get_word_frequency``
+counts, laid out as rows of sparse document-term matrices over one shared
+vocabulary. Scoring a batch of resumes against a batch of descriptions is a
+single sparse matrix product, so it scales to corpus-wide ranking.
+"""
+import numpy as np
+from scipy import sparse
+
+# Fewer documents than this give no meaningful IDF: with a single resume and
+# description every shared term gets the lowest weight, so they are compared
+# by term frequency alone
+MIN_IDF_DOCUMENTS = 5
+
+
+class Vocabulary:
+    """Interns terms to consecutive integer ids"""
+
+    def __init__(self, terms=()):
+        self.ids = {}
+        self.terms = []
+        for term in terms:
+            self.add(term)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self.ids
+
+    def add(self, term):
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def get(self, term):
+        return self.ids.get(term)
+
+
+def counts_matrix(counters, vocabulary, grow=True):
+    """CSR document-term count matrix for a list of term -> count mappings.
+
+    Unknown terms are added to the vocabulary when ``grow`` is set and
+    dropped otherwise.
+    """
+    indptr = [0]
+    indices = []
+    data = []
+    for counts in counters:
+        for term, count in counts.items():
+            term_id = vocabulary.add(term) if grow else vocabulary.get(term)
+            if term_id is not None:
+                indices.append(term_id)
+                data.append(count)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocabulary))
+    )
+
+
+def _pair_matrices(resume_counts, description_counts):
+    vocabulary = Vocabulary()
+    resumes = counts_matrix(resume_counts, vocabulary)
+    descriptions = counts_matrix(description_counts, vocabulary)
+    shape = len(vocabulary)
+    resumes.resize((resumes.shape[0], shape))
+    descriptions.resize((descriptions.shape[0], shape))
+    return resumes, descriptions
+
+
+def _l2_normalize(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def tfidf_similarity(resume_counts, description_counts):
+    """Cosine similarity (0-1) of TF-IDF vectors, resumes x descriptions.
+
+    Term frequencies are sublinear (1 + log count) and the smoothed IDF is
+    taken over all resumes and descriptions passed in; with fewer than
+    MIN_IDF_DOCUMENTS of them, it is plain sublinear-TF cosine.
+    """
+    resumes, descriptions = _pair_matrices(resume_counts, description_counts)
+    idf = None
+    if resumes.shape[0] + descriptions.shape[0] >= MIN_IDF_DOCUMENTS:
+        documents = sparse.vstack([resumes, descriptions]).tocsr()
+        document_frequency = np.bincount(documents.indices, minlength=documents.shape[1])
+        idf = sparse.diags(np.log((1 + documents.shape[0]) / (1 + document_frequency)) + 1)
+
+    def weigh(matrix):
+        matrix = matrix.copy()
+        matrix.data = 1 + np.log(matrix.data)
+        return _l2_normalize(matrix if idf is None else matrix @ idf)
+
+    return (weigh(resumes) @ weigh(descriptions).T).toarray()
+
+
+def bm25_scores(resume_counts, description_counts, k1=1.5, b=0.75):
+    """Okapi BM25 score of each resume for each description, resumes x descriptions.
+
+    Resumes are the documents being ranked (IDF and length normalization are
+    computed over them) and each description's distinct terms are the query.
+    """
+    resumes, descriptions = _pair_matrices(resume_counts, description_counts)
+    n_resumes = resumes.shape[0]
+    document_frequency = np.bincount(resumes.indices, minlength=resumes.shape[1])
+    idf = np.log(1 + (n_resumes - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    lengths = np.asarray(resumes.sum(axis=1)).ravel()
+    average_length = lengths.mean() if n_resumes and lengths.mean() > 0 else 1
+    weights = resumes.tocoo()
+    tf = weights.data
+    norm = k1 * (1 - b + b * lengths[weights.row] / average_length)
+    weights.data = idf[weights.col] * tf * (k1 + 1) / (tf + norm)
+
+    queries = descriptions.copy()
+    queries.data = np.ones_like(queries.data)
+    return (weights.tocsr() @ queries.T).toarray()
@@ -0,0 +1,200 @@
+"""Skill and job-role taxonomy loaded from a JSON or YAML file.
+
+A taxonomy file has the shape of ``data/taxonomy.json``::
+
+    {
+      "technical_skills": {"<category>": ["<skill>", {"name": "<skill>", "aliases": ["<alias>"]}]},
+      "soft_skills": ["<skill>", ...],
+      "education_keywords": [...],
+      "experience_keywords": [...],
+      "job_roles": {"<role>": {"key_skills": ["<skill>", ...], ...}}
+    }
+
+Loading compiles it once into an index: every skill gets an integer id, every
+alias maps to its canonical skill, each skill has a postings list of the roles
+that require it and each role has a bitset of its key skills. Extraction and
+matching query that index instead of walking the raw lists.
+"""
+import hashlib
+import json
+import os
+from functools import cached_property, lru_cache
+
+from matcher import KeywordMatcher, tokenize
+
+DEFAULT_TAXONOMY_PATH = os.environ.get(
+    'RESUME_ANALYZER_TAXONOMY',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'taxonomy.json')
+)
+
+
+class Taxonomy:
+    def __init__(self, data):
+        self.technical_skills = {}
+        self.soft_skills = []
+        self.education_keywords = list(data.get('education_keywords', []))
+        self.experience_keywords = list(data.get('experience_keywords', []))
+        self.job_roles = data.get('job_roles', {})
+        self.version = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+        # Skill index: id -> name / kind / category, and alias -> canonical name
+        self.skills = []
+        self.skill_ids = {}
+        self.skill_categories = []
+        self.aliases = {}
+        for category, entries in data.get('technical_skills', {}).items():
+            self.technical_skills[category] = [self._add_skill(entry, category) for entry in entries]
+        for entry in data.get('soft_skills', []):
+            self.soft_skills.append(self._add_skill(entry, None))
+
+        # Role index: skill id -> roles requiring it, role -> bitset of key skills
+        self.role_postings = {}
+        self.role_bits = {}
+        for role, info in self.job_roles.items():
+            bits = 0
+            for skill in info['key_skills']:
+                if skill not in self.skill_ids:
+                    raise ValueError(f"Job role '{role}' requires unknown skill '{skill}'")
+                skill_id = self.skill_ids[skill]
+                self.role_postings.setdefault(skill_id, []).append(role)
+                bits |= 1 << skill_id
+            self.role_bits[role] = bits
+
+        self.role_names = list(self.job_roles)
+        self._check_dotted_aliases()
+
+        self.skill_matcher = KeywordMatcher({alias: self.skill_ids[skill] for alias, skill in self.aliases.items()})
+        keyword_patterns = {keyword: ('education', keyword) for keyword in self.education_keywords}
+        keyword_patterns.update({keyword: ('experience', keyword) for keyword in self.experience_keywords})
+        self.keyword_matcher = KeywordMatcher(keyword_patterns)
+
+    def _add_skill(self, entry, category):
+        if isinstance(entry, str):
+            name, aliases = entry, []
+        else:
+            name, aliases = entry['name'], entry.get('aliases', [])
+        name = name.lower()
+        if name in self.skill_ids:
+            raise ValueError(f"Skill '{name}' is defined more than once")
+        self.skill_ids[name] = len(self.skills)
+        self.skills.append(name)
+        self.skill_categories.append(category)
+        for alias in [name, name.replace('-', ' ')] + [alias.lower() for alias in aliases]:
+            self.aliases.setdefault(alias, name)
+        return name
+
+    def _check_dotted_aliases(self):
+        """Reject an alias that would match the part of another skill's alias after a '.'.
+
+        The matcher makes '.' its own token, so an alias 'js' would find
+        JavaScript inside 'node.js', 'react.js' and 'vue.js'.
+        """
+        by_tokens = {tuple(tokenize(alias)): (alias, skill) for alias, skill in self.aliases.items()}
+        for alias, skill in self.aliases.items():
+            tokens = tokenize(alias)
+            for start in range(1, len(tokens)):
+                if tokens[start - 1] != '.':
+                    continue
+                for stop in range(start + 1, len(tokens) + 1):
+                    inner_alias, inner_skill = by_tokens.get(tuple(tokens[start:stop]), (None, skill))
+                    if inner_skill != skill:
+                        raise ValueError(f"Alias '{inner_alias}' of '{inner_skill}' would match inside "
+                                         f"'{alias}' of '{skill}'")
+
+    def resolve(self, name):
+        """Canonical skill for a skill name or alias, or None if unknown"""
+        return self.aliases.get(name.lower())
+
+    def skills_bitset(self, skills):
+        """Bitset of skill ids for an iterable of canonical skill names"""
+        bits = 0
+        for skill in skills:
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return bits
+
+    def skills_from_bitset(self, bits):
+        """Canonical skill names set in a bitset, in taxonomy order"""
+        names = []
+        while bits:
+            low_bit = bits & -bits
+            names.append(self.skills[low_bit.bit_length() - 1])
+            bits ^= low_bit
+        return names
+
+    def roles_for_skill(self, skill):
+        """Job roles that list a skill among their key skills"""
+        return list(self.role_postings.get(self.skill_ids.get(skill), []))
+
+    @cached_property
+    def role_matrix(self):
+        """Roles x skills 0/1 matrix for ranking every role in one product, built on first use"""
+        import numpy as np
+        matrix = np.zeros((len(self.role_names), len(self.skills)), dtype=np.float32)
+        for row, role in enumerate(self.role_names):
+            matrix[row, [self.skill_ids[skill] for skill in self.job_roles[role]['key_skills']]] = 1
+        return matrix
+
+    @cached_property
+    def role_sizes(self):
+        return self.role_matrix.sum(axis=1)
+
+    def skills_vector(self, skills):
+        """0/1 vector over the skill ids for an iterable of canonical skill names"""
+        import numpy as np
+        vector = np.zeros(len(self.skills), dtype=np.float32)
+        ids = [self.skill_ids[skill] for skill in skills if skill in self.skill_ids]
+        vector[ids] = 1
+        return vector
+
+    def rank_roles(self, skills, top_k=None):
+        """Score every job role against a set of skills, best match first.
+
+        Match percentages for all roles come from one matrix-vector product;
+        matched and missing skill lists (in key-skill order) are only built for
+        the ``top_k`` roles returned.
+        """
+        import numpy as np
+        vector = self.skills_vector(skills)
+        matched_counts = (self.role_matrix @ vector).astype(np.float64)
+        percentages = matched_counts / np.maximum(self.role_sizes, 1) * 100
+        order = np.argsort(-percentages, kind='stable')[:top_k]
+
+        ranking = []
+        for row in order:
+            role = self.role_names[row]
+            key_skills = self.job_roles[role]['key_skills']
+            ranking.append({
+                'role': role,
+                'match_percentage': float(percentages[row]),
+                'matched_skills': [skill for skill in key_skills if vector[self.skill_ids[skill]]],
+                'missing_skills': [skill for skill in key_skills if not vector[self.skill_ids[skill]]]
+            })
+        return ranking
+
+    def find_skill_ids(self, text):
+        """Ids of all skills mentioned in text, in taxonomy order"""
+        return sorted(self.skill_matcher.find(text))
+
+    def find_skill_ids_in_stream(self, chunks):
+        """Ids of all skills mentioned in a stream of text chunks, in taxonomy order"""
+        return sorted(self.skill_matcher.find_in_stream(chunks))
+
+
+def read_taxonomy_file(path):
+    """Parse a taxonomy file, choosing JSON or YAML by extension"""
+    with open(path, encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is required to load YAML taxonomies: pip install pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH):
+    """Load and index a taxonomy file once per process"""
+    return Taxonomy(read_taxonomy_file(path))
@@ -0,0 +1,157 @@
+"""Corpus-level word statistics from one sparse document-term count matrix.
+
+``document_term_matrix`` tokenizes N documents in one call, interns the
+words into a shared similarity.Vocabulary and returns a CSR matrix of counts,
+documents x terms. Row i holds the same counts as ``get_word_frequency``
+with the bundled tokenizer (nlp.WORD_PATTERN, used offline) would give for
+texts[i]. Corpus top-k, document
+frequency and per-document top terms are then array operations on the
+matrix rather than per-document Counters.
+
+Usage:
+    python vectorize.py resumes/ --top 30
+    python vectorize.py resumes/ --per-document > top_words.jsonl
+"""
+import argparse
+import json
+import re
+import sys
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+
+from similarity import Vocabulary
+
+# The words get_word_frequency keeps from nlp.WORD_PATTERN are exactly the
+# alphabetic runs of CHUNK_PATTERN, and no run spans whitespace. Splitting on
+# whitespace in C and classifying each distinct piece once is much cheaper
+# than running the lookaround pattern over every token.
+CHUNK_PATTERN = re.compile(r'[\w+#-]+')
+
+
+def document_term_matrix(texts, vocabulary=None, stop_words=frozenset(), grow=True):
+    """CSR count matrix (documents x terms) of the words in texts, and its vocabulary.
+
+    New words are interned in order of first appearance when ``grow`` is set
+    and dropped otherwise; stop words are never counted. Pass the returned
+    vocabulary back in to lay out further batches on the same columns.
+    """
+    vocabulary = Vocabulary() if vocabulary is None else vocabulary
+    documents = [text.lower().split() for text in texts]
+    pieces = list(chain.from_iterable(documents))
+
+    # Term ids of the words in each distinct piece, e.g. 'python/sql,' -> [id of python, id of sql]
+    piece_ids = dict.fromkeys(pieces)
+    for piece in piece_ids:
+        ids = []
+        for term in CHUNK_PATTERN.findall(piece):
+            if not term.isalpha() or term in stop_words:
+                continue
+            term_id = vocabulary.add(term) if grow else vocabulary.get(term)
+            if term_id is not None:
+                ids.append(term_id)
+        piece_ids[piece] = ids
+
+    # From here on pieces map to ids without a Python-level loop
+    per_piece = np.fromiter(map(len, map(piece_ids.__getitem__, pieces)), dtype=np.int64, count=len(pieces))
+    columns = np.fromiter(chain.from_iterable(map(piece_ids.__getitem__, pieces)), dtype=np.int64,
+                          count=int(per_piece.sum()))
+    piece_rows = np.repeat(np.arange(len(documents)), [len(document) for document in documents])
+    rows = np.repeat(piece_rows, per_piece)
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(columns), dtype=np.int64), (rows, columns)),
+        shape=(len(documents), len(vocabulary))
+    )
+    matrix.sum_duplicates()
+    return matrix, vocabulary
+
+
+def document_frequency(matrix):
+    """Number of documents each term occurs in"""
+    return np.bincount(matrix.indices, minlength=matrix.shape[1])
+
+
+def _ranked(values, k):
+    """Indices of the k largest non-zero values, largest first, ties by lower index"""
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    candidates = np.flatnonzero(values)
+    if k is not None and k < len(candidates):
+        # Keep every value tied with the k-th so the tie-break below sees all of them
+        threshold = np.partition(values[candidates], len(candidates) - k)[len(candidates) - k]
+        candidates = candidates[values[candidates] >= threshold]
+    order = np.lexsort((candidates, -values[candidates]))
+    return candidates[order[:k]]
+
+
+def corpus_top_k(matrix, vocabulary, k=20):
+    """The k most frequent terms across all documents as (term, count) pairs"""
+    totals = np.asarray(matrix.sum(axis=0)).ravel()
+    return [(vocabulary.terms[i], int(totals[i])) for i in _ranked(totals, k)]
+
+
+def top_k_by_document_frequency(matrix, vocabulary, k=20):
+    """The k terms found in the most documents as (term, document count) pairs"""
+    frequency = document_frequency(matrix)
+    return [(vocabulary.terms[i], int(frequency[i])) for i in _ranked(frequency, k)]
+
+
+def top_terms_per_document(matrix, vocabulary, k=20):
+    """Each document's k most frequent terms as (term, count) pairs.
+
+    Counts match ``Counter.most_common(k)`` of the document's words; ties go
+    to the term interned first, i.e. the one seen first in the corpus.
+    """
+    matrix = matrix.tocsr()
+    matrix.sum_duplicates()
+    row_lengths = np.diff(matrix.indptr)
+    rows = np.repeat(np.arange(matrix.shape[0]), row_lengths)
+    # All rows are ranked in one sort: by row, then count descending, then term id
+    order = np.lexsort((matrix.indices, -matrix.data, rows))
+    rank = np.arange(len(order)) - matrix.indptr[rows[order]]
+    order = order[rank < k]
+
+    terms = vocabulary.terms
+    pairs = [(terms[i], int(count)) for i, count in zip(matrix.indices[order].tolist(), matrix.data[order].tolist())]
+    bounds = np.concatenate(([0], np.cumsum(np.minimum(row_lengths, k)))).tolist()
+    return [pairs[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def main(argv=None):
+    from app import get_analyzer
+    from batch import collect_paths
+
+    parser = argparse.ArgumentParser(description="Word statistics over a corpus of resumes")
+    parser.add_argument('inputs', nargs='+', help="Resume files or directories")
+    parser.add_argument('--top', type=int, default=20, help="Terms to report")
+    parser.add_argument('--per-document', action='store_true',
+                        help="Print each document's top terms as JSON lines instead of corpus totals")
+    args = parser.parse_args(argv)
+
+    analyzer = get_analyzer()
+    paths, texts = [], []
+    for path in collect_paths(args.inputs):
+        try:
+            texts.append(analyzer.extract_text_from_path(path))
+            paths.append(path)
+        except Exception as e:
+            print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+
+    matrix, vocabulary = analyzer.word_count_matrix(texts)
+    if args.per_document:
+        for path, top_words in zip(paths, top_terms_per_document(matrix, vocabulary, args.top)):
+            print(json.dumps({'path': path, 'top_words': top_words}))
+        return 0
+
+    frequency = document_frequency(matrix)
+    print(f"{len(paths)} documents, {int(matrix.sum())} words, {len(vocabulary)} distinct")
+    print(f"{'term':<24} {'count':>8} {'documents':>10}")
+    for term, total in corpus_top_k(matrix, vocabulary, args.top):
+        print(f"{term:<24} {total:>8} {int(frequency[vocabulary.get(term)]):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())